@@ -7,13 +7,25 @@ Este módulo demonstra e compara a complexidade de algoritmos de busca:
 - Busca Linear: O(n)
 - Busca Binária: O(log n)
 
+Também oferece versões em lote, que respondem muitos alvos de uma vez
+(usando NumPy quando disponível).
+
 Autor: Algoritmo Project
 Data: 2025-10-21
 """
 
 import time
 import random
-from typing import List, Tuple, Optional
+from bisect import bisect_left
+from typing import List, Sequence, Tuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele as versões em lote usam Python puro
+    np = None
+
+# A partir de quantos alvos a busca binária em lote ordena os alvos antes
+LOTE_ORDENAR_ALVOS = 1000
 
 
 def busca_linear(lista: List[int], alvo: int) -> Tuple[Optional[int], int]:
@@ -84,6 +96,141 @@ def busca_binaria(lista: List[int], alvo: int) -> Tuple[Optional[int], int]:
     return None, comparacoes
 
 
+def busca_linear_lote(lista: Sequence[int], alvos: Sequence[int]):
+    """
+    Busca Linear em lote - Complexidade: O(n log n + m log n) com NumPy,
+    O(n + m) esperado sem NumPy, para m alvos
+
+    Devolve, para cada alvo, o mesmo índice e o mesmo número de comparações
+    que busca_linear, mas sem percorrer a lista uma vez por alvo: a posição
+    da primeira ocorrência de cada valor é calculada uma única vez. Com
+    NumPy ela vem de np.unique (que ordena a lista) e cada alvo é localizado
+    com searchsorted; sem NumPy vem de um dicionário.
+
+    Args:
+        lista: Lista de inteiros (não precisa estar ordenada)
+        alvos: Valores a serem buscados
+
+    Returns:
+        Tupla (índices, comparações). O índice é -1 quando o alvo não existe.
+        Com NumPy são arrays de inteiros, sem NumPy são listas.
+    """
+    n = len(lista)
+
+    if np is not None:
+        valores, primeiros = np.unique(np.asarray(lista), return_index=True)
+        alvos = np.asarray(alvos)
+        if n == 0:
+            vazio = np.full(alvos.shape, -1, dtype=np.int64)
+            return vazio, np.zeros(alvos.shape, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(valores, alvos), len(valores) - 1)
+        encontrado = valores[pos] == alvos
+        indices = np.where(encontrado, primeiros[pos], -1)
+        comparacoes = np.where(encontrado, indices + 1, n)
+        return indices, comparacoes
+
+    primeiro = {}
+    for i, valor in enumerate(lista):
+        primeiro.setdefault(valor, i)
+    indices = [primeiro.get(alvo, -1) for alvo in alvos]
+    comparacoes = [i + 1 if i >= 0 else n for i in indices]
+    return indices, comparacoes
+
+
+def busca_binaria_lote(lista: Sequence[int], alvos: Sequence[int], contar_comparacoes: bool = True):
+    """
+    Busca Binária em lote - Complexidade: O(m log n) para m alvos
+
+    Com NumPy, todos os alvos avançam juntos, um passo da busca binária por
+    iteração (no máximo ~log2(n) iterações vetorizadas), reproduzindo os
+    mesmos índices e contagens de comparações de busca_binaria. Sem
+    contar_comparacoes usa np.searchsorted direto, que é ainda mais rápido;
+    nesse caso, se houver valores repetidos, o índice é o da primeira
+    ocorrência. REQUER LISTA ORDENADA.
+
+    Args:
+        lista: Lista ordenada de inteiros (ou array NumPy, evita a conversão)
+        alvos: Valores a serem buscados
+        contar_comparacoes: Se False, não calcula as comparações
+
+    Returns:
+        Tupla (índices, comparações); comparações é None quando
+        contar_comparacoes é False. O índice é -1 quando o alvo não existe.
+        Com NumPy são arrays de inteiros, sem NumPy são listas.
+    """
+    n = len(lista)
+
+    if np is None:
+        if contar_comparacoes:
+            resultados = [busca_binaria(lista, alvo) for alvo in alvos]
+            return ([-1 if i is None else i for i, _ in resultados],
+                    [comp for _, comp in resultados])
+        indices = []
+        for alvo in alvos:
+            i = bisect_left(lista, alvo)
+            indices.append(i if i < n and lista[i] == alvo else -1)
+        return indices, None
+
+    arr = np.asarray(lista)
+    alvos = np.asarray(alvos)
+    forma = alvos.shape
+    alvos = alvos.ravel()
+    m = alvos.size
+    if n == 0:
+        vazio = np.full(forma, -1, dtype=np.int64)
+        return vazio, np.zeros(forma, dtype=np.int64) if contar_comparacoes else None
+
+    # Alvos em ordem acessam a lista de forma sequencial, o que aproveita
+    # muito melhor o cache em lotes grandes
+    ordem = None
+    if m > LOTE_ORDENAR_ALVOS and np.any(alvos[1:] < alvos[:-1]):
+        ordem = np.argsort(alvos, kind="stable")
+        alvos = alvos[ordem]
+
+    indices = np.full(m, -1, dtype=np.int64)
+    comparacoes = None
+    if not contar_comparacoes:
+        pos = np.minimum(np.searchsorted(arr, alvos), n - 1)
+        encontrado = arr[pos] == alvos
+        indices[encontrado] = pos[encontrado]
+    else:
+        # Simulação vetorizada: cada alvo tem seu próprio intervalo [esquerda, direita]
+        esquerda = np.zeros(m, dtype=np.int64)
+        direita = np.full(m, n - 1, dtype=np.int64)
+        comparacoes = np.zeros(m, dtype=np.int64)
+        ativos = np.arange(m)
+
+        while ativos.size:
+            meio = (esquerda[ativos] + direita[ativos]) // 2
+            valor = arr[meio]
+            alvo = alvos[ativos]
+            comparacoes[ativos] += 1
+
+            igual = valor == alvo
+            indices[ativos[igual]] = meio[igual]
+            menor = valor < alvo
+            esquerda[ativos[menor]] = meio[menor] + 1
+            maior = valor > alvo
+            direita[ativos[maior]] = meio[maior] - 1
+
+            # Continuam só os alvos não encontrados com intervalo não vazio
+            ativos = ativos[~igual]
+            ativos = ativos[esquerda[ativos] <= direita[ativos]]
+
+    if ordem is not None:
+        # Devolve os resultados na ordem original dos alvos
+        desordenados = np.empty_like(indices)
+        desordenados[ordem] = indices
+        indices = desordenados
+        if comparacoes is not None:
+            desordenadas = np.empty_like(comparacoes)
+            desordenadas[ordem] = comparacoes
+            comparacoes = desordenadas
+
+    indices = indices.reshape(forma)
+    return indices, comparacoes.reshape(forma) if comparacoes is not None else None
+
+
 def comparar_algoritmos(tamanho: int, num_testes: int = 10):
     """
     Compara o desempenho prático dos algoritmos de busca.
@@ -137,6 +284,23 @@ def comparar_algoritmos(tamanho: int, num_testes: int = 10):
     print(f"    • Redução de comparações: {comp_linear_total / comp_binaria_total:.2f}x")
     print(f"    • Aceleração de tempo: {tempo_linear_total / tempo_binaria_total:.2f}x")
 
+    # Mesmas buscas, todas numa chamada só; a conversão para array NumPy
+    # é feita uma vez, fora da medição, como num uso real com muitos lotes
+    lista_lote = np.asarray(lista) if np is not None else lista
+    inicio = time.perf_counter()
+    _, comp_linear_lote = busca_linear_lote(lista_lote, elementos_teste)
+    tempo_linear_lote = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    _, comp_binaria_lote = busca_binaria_lote(lista_lote, elementos_teste)
+    tempo_binaria_lote = time.perf_counter() - inicio
+
+    print(f"\n  Em lote ({'NumPy' if np is not None else 'Python puro'}, {num_testes} alvos por chamada):")
+    print(f"    • Busca Linear: {tempo_linear_lote / num_testes * 1e6:.4f} us por busca, "
+          f"mesmas comparações: {'sim' if sum(comp_linear_lote) == comp_linear_total else 'não'}")
+    print(f"    • Busca Binária: {tempo_binaria_lote / num_testes * 1e6:.4f} us por busca, "
+          f"mesmas comparações: {'sim' if sum(comp_binaria_lote) == comp_binaria_total else 'não'}")
+
     # Análise teórica
     import math
     comp_teorica_linear = tamanho / 2  # Caso médio
@@ -148,6 +312,50 @@ def comparar_algoritmos(tamanho: int, num_testes: int = 10):
     print(f"    • Diferença teórica: {comp_teorica_linear / comp_teorica_binaria:.2f}x")
 
 
+def comparar_lote(tamanho: int = 1_000_000, num_buscas: int = 1_000_000):
+    """
+    Compara buscas uma a uma com as versões em lote num volume grande de
+    consultas contra a mesma lista ordenada.
+
+    Args:
+        tamanho: Tamanho da lista ordenada
+        num_buscas: Número de alvos buscados
+    """
+    print(f"\n{'='*70}")
+    print(f"BUSCA EM LOTE - {num_buscas:,} buscas em {tamanho:,} elementos")
+    print(f"{'='*70}")
+
+    lista = sorted(random.sample(range(tamanho * 10), tamanho))
+    alvos = [random.randrange(tamanho * 10) for _ in range(num_buscas)]
+
+    # Uma a uma, medido numa amostra e extrapolado
+    amostra = alvos[:min(num_buscas, 100_000)]
+    inicio = time.perf_counter()
+    for alvo in amostra:
+        busca_binaria(lista, alvo)
+    tempo_individual = (time.perf_counter() - inicio) / len(amostra) * num_buscas
+    print(f"\n  Busca Binária uma a uma: {tempo_individual:.3f} s (estimado a partir de {len(amostra):,} buscas)")
+
+    if np is not None:
+        lista = np.asarray(lista)
+        alvos = np.asarray(alvos)
+
+    inicio = time.perf_counter()
+    busca_binaria_lote(lista, alvos)
+    tempo_lote = time.perf_counter() - inicio
+    print(f"  Busca Binária em lote, contando comparações: {tempo_lote:.3f} s "
+          f"({tempo_individual / tempo_lote:.1f}x)")
+
+    inicio = time.perf_counter()
+    busca_binaria_lote(lista, alvos, contar_comparacoes=False)
+    tempo_rapido = time.perf_counter() - inicio
+    print(f"  Busca Binária em lote, sem contar comparações: {tempo_rapido:.3f} s "
+          f"({tempo_individual / tempo_rapido:.1f}x)")
+
+    if np is None:
+        print("\n  NumPy não está instalado: as versões em lote usaram Python puro.")
+
+
 def demonstrar_casos():
     """Demonstra casos específicos de uso dos algoritmos."""
     print("\n" + "="*70)
@@ -200,6 +408,9 @@ if __name__ == "__main__":
     for tamanho in tamanhos:
         comparar_algoritmos(tamanho, num_testes=10)
 
+    # Muitas consultas contra a mesma lista
+    comparar_lote()
+
     print(f"\n{'='*70}")
     print("CONCLUSÃO:")
     print("="*70)
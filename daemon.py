@@ -0,0 +1,231 @@
+"""
+Scheduler daemon
+
+Keeps one process running both scrapers on their own intervals, so each
+run skips interpreter and import startup, and the Instagram sessions
+stay logged in between runs. Jobs run concurrently up to
+--max-concurrent. A job that is still running when it is due again is
+skipped for that round instead of piling up. Each due time gets a
+random jitter.
+
+    python daemon.py --news-every 15m --news-args="--crawl --format jsonl --output manchetes.jsonl" \\
+        --instagram-every 1h --profiles perfis.txt --history instagram_history.db
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import heapq
+import random
+import re
+import shlex
+import signal
+import threading
+import time
+
+from metrics import REGISTRY
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(text):
+    """
+    Seconds from '90', '30s', '15m', '1h' or '1d'
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", str(text))
+    if not match:
+        raise ValueError(f"Invalid interval: {text!r}")
+    return float(match.group(1)) * _UNITS[match.group(2) or "s"]
+
+
+def log(message):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+class Job:
+    """
+    A callable run every interval seconds, spread by +/- jitter (a
+    fraction of the interval)
+    """
+
+    def __init__(self, name, function, interval, jitter=0.1, run_at_start=True, close=None):
+        self.name = name
+        self.function = function
+        self.interval = interval
+        self.jitter = jitter
+        self.run_at_start = run_at_start
+        self.close = close
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_seconds = None
+
+    def next_due(self, after):
+        return after + self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class Scheduler:
+    """
+    Runs jobs on their intervals in a thread pool of max_concurrent
+    workers, until stop() is called. With metrics_prefix the metrics
+    registry is written out after every job run.
+    """
+
+    def __init__(self, jobs, max_concurrent=2, metrics_prefix=None):
+        self.jobs = {job.name: job for job in jobs}
+        self.max_concurrent = max_concurrent
+        self.metrics_prefix = metrics_prefix
+        self._running = 0
+        self._lock = threading.Lock()
+        # Jobs finishing together would otherwise write the same .tmp files
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+
+    def _run(self, job):
+        start = time.perf_counter()
+        result = "ok"
+        try:
+            job.function()
+        except Exception as e:
+            result = "failed"
+            job.failures += 1
+            log(f"{job.name}: failed: {type(e).__name__}: {e}")
+        else:
+            log(f"{job.name}: done in {time.perf_counter() - start:.1f}s")
+        finally:
+            job.last_seconds = time.perf_counter() - start
+            job.runs += 1
+            # Free the slot first, so nothing below can leave the job marked running
+            with self._lock:
+                job.running = False
+                self._running -= 1
+            self._wakeup.set()
+
+        REGISTRY.observe("daemon_job_seconds", job.last_seconds, job=job.name)
+        REGISTRY.incr("daemon_job_runs_total", job=job.name, result=result)
+        if self.metrics_prefix:
+            try:
+                with self._write_lock:
+                    REGISTRY.write(self.metrics_prefix)
+            except Exception as e:
+                log(f"Could not write metrics: {type(e).__name__}: {e}")
+
+    def run(self):
+        now = time.time()
+        due = [(now if job.run_at_start else job.next_due(now), name) for name, job in self.jobs.items()]
+        heapq.heapify(due)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            while not self._stop.is_set():
+                now = time.time()
+                full = False
+                while due and due[0][0] <= now:
+                    with self._lock:
+                        full = self._running >= self.max_concurrent
+                        if full:
+                            break  # Wait for a finished job to free a slot, the job stays due
+                        when, name = heapq.heappop(due)
+                        job = self.jobs[name]
+                        overlapping = job.running
+                        if not overlapping:
+                            job.running = True
+                            self._running += 1
+
+                    # Keep the schedule anchored to due times, skipping rounds that were missed
+                    next_time = job.next_due(when)
+                    while next_time <= now:
+                        next_time = job.next_due(next_time)
+                    heapq.heappush(due, (next_time, name))
+
+                    if overlapping:
+                        job.skipped += 1
+                        REGISTRY.incr("daemon_job_skipped_total", job=name)
+                        log(f"{name}: still running, skipping this round")
+                        continue
+                    log(f"{name}: starting")
+                    executor.submit(self._run, job)
+
+                timeout = 60 if full or not due else max(due[0][0] - time.time(), 0.05)
+                self._wakeup.wait(min(timeout, 60))
+                self._wakeup.clear()
+
+            log("Stopping, waiting for running jobs to finish")
+
+        for job in self.jobs.values():
+            if job.close is not None:
+                job.close()
+
+    def stop(self, *_):
+        self._stop.set()
+        self._wakeup.set()
+
+
+def news_job(interval, news_args="", jitter=0.1):
+    from news_scraper.scraper import build_parser, scrape_from_args
+
+    # Parsed once up front so bad options fail at startup
+    args = build_parser().parse_args(shlex.split(news_args))
+    # Errors are re-raised so a failed run is logged and counted as failed
+    return Job("news", lambda: scrape_from_args(args, raise_errors=True), interval, jitter)
+
+
+def instagram_job(interval, profiles_file, history_db=None, pool_size=1, fast=True, jitter=0.1):
+    from instagram_bot.batch import read_profiles
+    from instagram_bot.bot import record_history
+    from instagram_bot.session_pool import DriverPool, create_restored_driver, scrape_profiles
+
+    # The pool outlives each run, so sessions stay logged in between runs.
+    # Nobody is at the console, so an expired session fails the run instead of prompting
+    pool = DriverPool(pool_size, factory=lambda: create_restored_driver(fast))
+
+    def run():
+        results = scrape_profiles(read_profiles(profiles_file), pool=pool)
+        failed = sum(1 for result in results if "error" in result)
+        log(f"instagram: scraped {len(results) - failed} of {len(results)} profiles")
+        if history_db:
+            record_history(results, history_db)
+
+    return Job("instagram", run, interval, jitter, close=pool.close)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scrapers on a schedule")
+    parser.add_argument("--news-every", type=parse_interval, default=None, metavar="INTERVAL",
+                        help="run the news scraper every INTERVAL (e.g. 15m)")
+    parser.add_argument("--news-args", default="",
+                        help='news scraper options as one string, e.g. --news-args="--crawl --db manchetes.db"')
+    parser.add_argument("--instagram-every", type=parse_interval, default=None, metavar="INTERVAL",
+                        help="scrape the profiles in --profiles every INTERVAL (e.g. 1h)")
+    parser.add_argument("--profiles", default=None, help="file with one profile handle per line")
+    parser.add_argument("--history", metavar="DB", default=None,
+                        help="record the Instagram snapshots in this history database")
+    parser.add_argument("--pool-size", type=int, default=1, help="Instagram browser sessions")
+    parser.add_argument("--no-fast", dest="fast", action="store_false",
+                        help="load full Instagram pages with a visible browser")
+    parser.add_argument("--max-concurrent", type=int, default=2, help="jobs running at the same time")
+    parser.add_argument("--jitter", type=float, default=0.1,
+                        help="random spread of due times, as a fraction of the interval")
+    parser.add_argument("--metrics", metavar="PREFIX", default=None,
+                        help="write metrics to PREFIX.prom and PREFIX.json after every job run")
+    args = parser.parse_args(argv)
+
+    jobs = []
+    if args.news_every:
+        jobs.append(news_job(args.news_every, args.news_args, args.jitter))
+    if args.instagram_every:
+        if not args.profiles:
+            parser.error("--instagram-every needs --profiles")
+        jobs.append(instagram_job(args.instagram_every, args.profiles, args.history, args.pool_size,
+                                  args.fast, args.jitter))
+    if not jobs:
+        parser.error("nothing to schedule: give --news-every and/or --instagram-every")
+
+    scheduler = Scheduler(jobs, args.max_concurrent, args.metrics)
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    signal.signal(signal.SIGINT, scheduler.stop)
+    log("Scheduled " + ", ".join(f"{job.name} every {job.interval:g}s" for job in jobs))
+    scheduler.run()
+
+
+if __name__ == "__main__":
+    main()
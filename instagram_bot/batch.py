@@ -0,0 +1,176 @@
+"""
+Batch profile scraping
+
+Reads profile handles from a file (one per line, '#' comments allowed),
+scrapes them across N worker processes that each own a browser, and
+streams one JSON line per profile, with timings and errors, as results
+come in. Workers reuse the session saved by an interactive run of the
+bot, since they cannot prompt for a manual login.
+
+    python -m instagram_bot.batch perfis.txt --workers 4 --output instagram_bio.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from instagram_bot.bot import INSTAGRAM_URL, create_driver, scrape_profile
+from instagram_bot.session_store import COOKIES_FILE, load_cookies, restore_session
+from instagram_bot.snapshots import SnapshotStore
+
+# Sentinel a worker sends once it has drained the task queue
+WORKER_DONE = "__done__"
+
+
+def read_profiles(path):
+    profiles = []
+    with open(path, encoding='utf-8') as profiles_file:
+        for line in profiles_file:
+            handle = line.split('#', 1)[0].strip().lstrip('@')
+            if handle:
+                profiles.append(handle)
+    return profiles
+
+
+def _start_session(fast, cookies_file):
+    driver = create_driver(fast=fast)
+    if not restore_session(driver, INSTAGRAM_URL, cookies_file):
+        driver.quit()
+        raise RuntimeError("Saved Instagram session is missing or expired")
+    return driver
+
+
+def worker(worker_id, tasks, results, fast, cookies_file):
+    """
+    Worker process: scrape handles from tasks until the None sentinel,
+    sending one result dict per handle to results. Once a session fails
+    to start, the remaining handles are reported as errors without
+    launching another browser.
+    """
+    driver = None
+    session_error = None
+    try:
+        while True:
+            profile = tasks.get()
+            if profile is None:
+                break
+
+            record = {"profile": profile, "worker": worker_id}
+            if session_error is not None:
+                record["error"] = f"Skipped, no session: {session_error}"
+                record["seconds"] = 0.0
+                results.put(record)
+                continue
+
+            start = time.perf_counter()
+            try:
+                if driver is None:
+                    session_start = time.perf_counter()
+                    try:
+                        driver = _start_session(fast, cookies_file)
+                    except Exception as e:
+                        session_error = f"{type(e).__name__}: {e}"
+                        raise
+                    record["session_seconds"] = round(time.perf_counter() - session_start, 3)
+                record.update(scrape_profile(driver, profile))
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+                if isinstance(e, WebDriverException) and driver is not None:
+                    # Start over with a fresh browser if this one died
+                    try:
+                        driver.current_url
+                    except WebDriverException:
+                        driver = None
+            record["seconds"] = round(time.perf_counter() - start, 3)
+            results.put(record)
+    finally:
+        if driver is not None:
+            driver.quit()
+        results.put(WORKER_DONE)
+
+
+def scrape_batch(profiles, output_file="instagram_bio.jsonl", workers=4, fast=True,
+                 cookies_file=COOKIES_FILE, history_db=None):
+    """
+    Scrape profiles across worker processes and append one JSON line per
+    profile to output_file as soon as it is done. history_db also records
+    every successful snapshot in a SnapshotStore. Returns the number of
+    profiles that failed.
+    """
+    if load_cookies(cookies_file) is None:
+        raise RuntimeError("No valid saved session: run the bot once interactively to log in")
+
+    workers = max(1, min(workers, len(profiles)))
+    tasks = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    for profile in profiles:
+        tasks.put(profile)
+    for _ in range(workers):
+        tasks.put(None)
+
+    processes = [
+        multiprocessing.Process(target=worker, args=(i, tasks, results, fast, cookies_file), daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    store = SnapshotStore(history_db) if history_db else None
+    done = 0
+    written = 0
+    failures = 0
+    start = time.perf_counter()
+    with open(output_file, 'a', encoding='utf-8') as output:
+        while done < workers:
+            try:
+                record = results.get(timeout=5)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break  # Workers died without saying goodbye
+                continue
+            if record == WORKER_DONE:
+                done += 1
+                continue
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            written += 1
+            if store is not None:
+                store.record(record)
+            if "error" in record:
+                failures += 1
+                print(f"[{written}/{len(profiles)}] {record['profile']}: {record['error']}")
+            else:
+                print(f"[{written}/{len(profiles)}] {record['profile']} ({record['seconds']}s)")
+
+    for process in processes:
+        process.join()
+    if store is not None:
+        store.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Scraped {written - failures} of {len(profiles)} profiles in {elapsed:.1f}s "
+          f"({written / elapsed * 60:.1f} profiles/min), saved to {output_file}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape many Instagram profiles in parallel")
+    parser.add_argument("profiles_file", help="file with one profile handle per line")
+    parser.add_argument("--workers", type=int, default=4, help="worker processes, one browser each")
+    parser.add_argument("--output", default="instagram_bio.jsonl")
+    parser.add_argument("--no-fast", dest="fast", action="store_false",
+                        help="load full pages with a visible browser")
+    parser.add_argument("--history", metavar="DB", default=None,
+                        help="also record the snapshots in this history database")
+    args = parser.parse_args(argv)
+
+    profiles = read_profiles(args.profiles_file)
+    failures = scrape_batch(profiles, args.output, args.workers, args.fast, history_db=args.history)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
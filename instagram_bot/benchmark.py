@@ -0,0 +1,123 @@
+"""
+Offline benchmark for the Instagram bot
+
+Runs the bot against the local stand-in server (see standin_server.py)
+and prints a JSON report with profiles/minute and per-phase latency:
+browser start, login, session restore from saved cookies, and for each
+profile the page open/wait and field extraction.
+
+    python -m instagram_bot.benchmark --profiles 30 --render-delay 0.2 --dialogs 2
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from instagram_bot.bot import create_driver, extract_profile, login, open_profile
+from instagram_bot.standin_server import StandinServer
+
+
+def summarize(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(ordered[int(0.50 * (len(ordered) - 1))] * 1000, 2),
+        "p99_ms": round(ordered[int(round(0.99 * (len(ordered) - 1)))] * 1000, 2)
+    }
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(profile_count=20, latency=0.0, render_delay=0.0, dialogs=2, profile_dialog=False,
+                  fast=True, headless=None):
+    profiles = [f"perfil_{i:04d}" for i in range(profile_count)]
+    phases = {"open_profile": [], "extract": []}
+    errors = 0
+
+    server = StandinServer(latency=latency, render_delay=render_delay, dialogs=dialogs,
+                           profile_dialog=profile_dialog)
+    with server, tempfile.TemporaryDirectory() as workdir:
+        cookies_file = os.path.join(workdir, "cookies.json")
+
+        driver, driver_start = timed(create_driver, fast=fast, headless=headless)
+        try:
+            _, login_time = timed(login, driver, cookies_file, ("benchmark", "benchmark"), server.base_url)
+
+            start = time.perf_counter()
+            for profile in profiles:
+                try:
+                    _, open_time = timed(open_profile, driver, profile, server.base_url)
+                    fields, extract_time = timed(extract_profile, driver)
+                except Exception as e:
+                    print(f"{profile}: {e}")
+                    errors += 1
+                    continue
+                if not fields.get("username"):
+                    errors += 1
+                phases["open_profile"].append(open_time)
+                phases["extract"].append(extract_time)
+            scraping_time = time.perf_counter() - start
+        finally:
+            driver.quit()
+
+        # A second browser picks up the saved session instead of logging in
+        driver = create_driver(fast=fast, headless=headless)
+        try:
+            _, restore_time = timed(login, driver, cookies_file, ("benchmark", "benchmark"), server.base_url)
+        finally:
+            driver.quit()
+
+    return {
+        "config": {
+            "profiles": profile_count,
+            "latency": latency,
+            "render_delay": render_delay,
+            "dialogs": dialogs,
+            "profile_dialog": profile_dialog,
+            "fast": fast
+        },
+        "profiles_per_minute": round(len(phases["open_profile"]) / scraping_time * 60, 2),
+        "errors": errors,
+        "phases": {
+            "driver_start_ms": round(driver_start * 1000, 2),
+            "login_ms": round(login_time * 1000, 2),
+            "session_restore_ms": round(restore_time * 1000, 2),
+            "open_profile": summarize(phases["open_profile"]),
+            "extract": summarize(phases["extract"])
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Instagram bot against a local stand-in")
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--render-delay", type=float, default=0.0,
+                        help="seconds before page content is rendered client-side")
+    parser.add_argument("--dialogs", type=int, default=2, choices=[0, 1, 2])
+    parser.add_argument("--profile-dialog", action="store_true", help="show a dialog on profile pages")
+    parser.add_argument("--no-fast", dest="fast", action="store_false")
+    parser.add_argument("--headed", dest="headless", action="store_false", default=None)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.profiles, args.latency, args.render_delay, args.dialogs,
+                           args.profile_dialog, args.fast, args.headless)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(data + "\n")
+    print(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,143 +4,434 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import argparse
 import json
 import time
 import os
 
-def scrape_instagram_bio():
+from metrics import REGISTRY, incr, timer
+from instagram_bot.session_store import COOKIES_FILE, LOGGED_IN_XPATH, restore_session, save_cookies
+
+INSTAGRAM_URL = "https://www.instagram.com/"
+DEFAULT_PROFILE = "computacaounifavip_"
+
+PROFILE_XPATHS = {
+    "bio": "//header//section//div//div[2]",
+    "username": "//header//section//div//h2",
+    "followers": "//header//section//ul//li[2]//a//span",
+    "following": "//header//section//ul//li[3]//a//span",
+    "posts_count": "//header//section//ul//li[1]//span"
+}
+
+# Content settings: 2 = block
+FAST_MODE_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2
+}
+
+FAST_MODE_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-notifications",
+    "--mute-audio",
+    "--no-first-run",
+    "--window-size=1280,900"
+]
+
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.mp4", "*.webm", "*.m4a", "*.m4v",
+    "*.woff", "*.woff2", "*.ttf", "*.otf"
+]
+
+NOT_NOW_XPATH = "//button[contains(text(), 'Not Now')]"
+
+# Pause after dismissing a dialog, while it animates out
+DIALOG_SETTLE_SECONDS = 0.3
+
+# Possible outcomes of opening a profile page, by priority
+PROFILE_STATES = {
+    "dialog": NOT_NOW_XPATH,
+    "login": "//input[@name='username']",
+    "profile": PROFILE_XPATHS["username"]
+}
+
+# Name of the first [name, xpath] pair present in the page, or null
+FIRST_PRESENT_JS = """
+var states = arguments[0];
+for (var i = 0; i < states.length; i++) {
+    var node = document.evaluate(states[i][1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+        .singleNodeValue;
+    if (node) {
+        return states[i][0];
+    }
+}
+return null;
+"""
+
+# Resolves every XPath in the page itself and returns all fields at once
+EXTRACT_PROFILE_JS = """
+var xpaths = arguments[0];
+function first(xpath) {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+        .singleNodeValue;
+}
+function text(node) {
+    return node ? node.innerText : null;
+}
+var followers = first(xpaths.followers);
+return {
+    username: text(first(xpaths.username)),
+    bio: text(first(xpaths.bio)),
+    followers: followers ? (followers.getAttribute("title") || followers.innerText) : null,
+    following: text(first(xpaths.following)),
+    posts_count: text(first(xpaths.posts_count))
+};
+"""
+
+
+def build_chrome_options(fast=False, headless=None, profile_dir=None):
     """
-    Instagram bot that:
-    1. Logs in to Instagram
-    2. Navigates to a specific profile (@computacaounifavip_)
-    3. Extracts bio information
-    4. Saves to JSON file
+    Chrome options for the bot. fast mode runs headless (unless headless
+    is False), does not load images, fonts or media, returns from page
+    loads at DOMContentLoaded and turns off browser features the bot does
+    not need.
     """
-    
     # Set up Chrome options
     chrome_options = Options()
-    # Uncomment the next line if you want to run in headless mode
-    # chrome_options.add_argument("--headless")
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    
+    # Pass headless=True (or fast=True) to run without a window
+    if headless or (headless is None and fast):
+        chrome_options.add_argument("--headless=new")
+    if profile_dir:
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+
+    if fast:
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_experimental_option("prefs", FAST_MODE_PREFS)
+        for argument in FAST_MODE_ARGUMENTS:
+            chrome_options.add_argument(argument)
+
+    return chrome_options
+
+
+def create_driver(profile_dir=None, fast=False, headless=None):
+    """
+    Start a Chrome session, optionally on a persistent browser profile
+    directory that keeps the login between runs, and optionally in fast
+    mode (see build_chrome_options)
+    """
+    with timer("bot_driver_start_seconds", fast=fast):
+        driver = webdriver.Chrome(options=build_chrome_options(fast, headless, profile_dir))
+
+    if fast:
+        # Block what the preferences cannot switch off, like video and web fonts
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+    return driver
+
+
+class SessionExpiredError(Exception):
+    """
+    The browser was sent back to the login form
+    """
+
+
+def wait_for_any(driver, states, timeout=10, poll=0.1):
+    """
+    Wait until one of several page states shows up and return its name,
+    or None on timeout. states maps a name to an XPath; all of them are
+    checked in one round trip per poll, in order, so earlier entries win
+    when several are present.
+    """
+    candidates = list(states.items())
+    start = time.perf_counter()
     try:
-        print("Opening Instagram...")
-        driver.get("https://www.instagram.com/")
-        
-        # Wait for the page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.NAME, "username"))
+        state = WebDriverWait(driver, timeout, poll_frequency=poll).until(
+            lambda d: d.execute_script(FIRST_PRESENT_JS, candidates)
         )
-        
-        # Find login fields and enter credentials
-        # Note: You need to provide actual Instagram credentials for this to work
-        username_input = driver.find_element(By.NAME, "username")
-        password_input = driver.find_element(By.NAME, "password")
-        
-        # For this example, we'll use placeholders
-        # In a real scenario, you'd need to provide actual credentials
-        # or prompt the user for them
+    except TimeoutException:
+        state = None
+    REGISTRY.observe("bot_wait_seconds", time.perf_counter() - start, state=state or "timeout")
+    return state
+
+
+def dismiss_dialog(driver):
+    """
+    Click the 'Not Now' button of the dialog on screen, True if clicked
+    """
+    try:
+        driver.find_element(By.XPATH, NOT_NOW_XPATH).click()
+    except WebDriverException:
+        return False
+    print("Clicked 'Not Now' on dialog")
+    return True
+
+
+def login(driver, cookies_file=COOKIES_FILE, credentials=None, base_url=INSTAGRAM_URL, interactive=True):
+    """
+    Log in to Instagram. A session saved by an earlier run is restored
+    from cookies_file when still valid; otherwise the (username, password)
+    credentials are typed into the form, or without them the user logs in
+    manually in the browser. Then the dialogs shown right after login are
+    dismissed and the new session is saved for next time.
+
+    interactive=False is for headless browsers, where nobody can log in
+    by hand: without a valid session or credentials SessionExpiredError
+    is raised instead of prompting.
+    """
+    print("Opening Instagram...")
+    with timer("bot_session_restore_seconds"):
+        restored = bool(cookies_file) and restore_session(driver, base_url, cookies_file)
+    if restored:
+        print("Restored saved Instagram session")
+        incr("bot_logins_total", method="restored")
+        return
+    if not credentials and not interactive:
+        raise SessionExpiredError("Saved Instagram session is missing or expired: "
+                                  "run the bot once without --fast to log in")
+
+    login_start = time.perf_counter()
+
+    driver.get(base_url)
+
+    # Wait for the page to load
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.NAME, "username"))
+    )
+
+    # Find login fields and enter credentials
+    # Note: You need to provide actual Instagram credentials for this to work
+    username_input = driver.find_element(By.NAME, "username")
+    password_input = driver.find_element(By.NAME, "password")
+
+    if credentials:
+        username, password = credentials
+        username_input.send_keys(username)
+        password_input.send_keys(password)
+        password_input.send_keys(Keys.RETURN)
+    else:
         print("Please enter Instagram credentials manually in the browser...")
         input("Press Enter in this console after logging in manually...")
-        
-        # Handle "Save Info" dialog if it appears
-        try:
-            not_now_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Not Now')]"))
-            )
-            not_now_button.click()
-            print("Clicked 'Not Now' on save info dialog")
-        except:
-            print("No save info dialog appeared or already handled")
-        
-        # Handle "Turn on Notifications" dialog if it appears
-        try:
-            not_now_notifications = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Not Now')]"))
-            )
-            not_now_notifications.click()
-            print("Clicked 'Not Now' on notifications dialog")
-        except:
-            print("No notifications dialog appeared or already handled")
-        
+
+    # Handle the "Save Info" and "Turn on Notifications" dialogs as they
+    # appear, and move on as soon as the logged-in page is there instead
+    for _ in range(2):
+        state = wait_for_any(driver, {"dialog": NOT_NOW_XPATH, "home": LOGGED_IN_XPATH}, timeout=5)
+        if state != "dialog" or not dismiss_dialog(driver):
+            break
+
+    if cookies_file:
+        save_cookies(driver, cookies_file)
+    REGISTRY.observe("bot_login_seconds", time.perf_counter() - login_start,
+                     method="credentials" if credentials else "manual")
+    incr("bot_logins_total", method="credentials" if credentials else "manual")
+
+
+def extract_profile_js(driver):
+    """
+    Extract every profile field in one WebDriver round trip, None if the
+    script could not run
+    """
+    try:
+        fields = driver.execute_script(EXTRACT_PROFILE_JS, PROFILE_XPATHS)
+    except WebDriverException:
+        return None
+    return fields if isinstance(fields, dict) else None
+
+
+def extract_profile_xpath(driver):
+    """
+    Extract the profile fields element by element (one round trip each)
+    """
+    # Extract bio information
+    bio = None
+    try:
+        bio_element = driver.find_element(By.XPATH, PROFILE_XPATHS["bio"])
+        bio = bio_element.text
+    except:
+        print("Could not find bio element")
+
+    # Extract other profile information
+    username = None
+    followers = None
+    following = None
+    posts_count = None
+
+    try:
+        # Get username
+        username_element = driver.find_element(By.XPATH, PROFILE_XPATHS["username"])
+        username = username_element.text
+    except:
+        print("Could not find username")
+
+    try:
+        # Get followers count
+        followers_element = driver.find_element(By.XPATH, PROFILE_XPATHS["followers"])
+        followers = followers_element.get_attribute("title") or followers_element.text
+    except:
+        print("Could not find followers count")
+
+    try:
+        # Get following count
+        following_element = driver.find_element(By.XPATH, PROFILE_XPATHS["following"])
+        following = following_element.text
+    except:
+        print("Could not find following count")
+
+    try:
+        # Get posts count
+        posts_element = driver.find_element(By.XPATH, PROFILE_XPATHS["posts_count"])
+        posts_count = posts_element.text
+    except:
+        print("Could not find posts count")
+
+    return {
+        "username": username,
+        "bio": bio,
+        "followers": followers,
+        "following": following,
+        "posts_count": posts_count
+    }
+
+
+def open_profile(driver, target_profile, base_url=INSTAGRAM_URL, timeout=10):
+    """
+    Navigate to target_profile and wait until its header is rendered,
+    dismissing any dialog that shows up first
+    """
+    with timer("bot_page_load_seconds"):
+        driver.get(f"{base_url}{target_profile}/")
+
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"Profile page of {target_profile} did not load")
+        state = wait_for_any(driver, PROFILE_STATES, timeout=remaining)
+        if state == "profile":
+            return
+        if state == "login":
+            raise SessionExpiredError(f"Login required to open {target_profile}")
+        if state is None:
+            raise TimeoutException(f"Profile page of {target_profile} did not load")
+        if dismiss_dialog(driver):
+            incr("bot_dialogs_dismissed_total")
+        # Give the dialog time to animate out (or the click to stop being
+        # intercepted) before looking again
+        time.sleep(min(DIALOG_SETTLE_SECONDS, max(0, deadline - time.monotonic())))
+
+
+def extract_profile(driver):
+    """
+    Extract the profile fields from the open profile page
+    """
+    start = time.perf_counter()
+    method = "js"
+    fields = extract_profile_js(driver)
+    if not fields or not any(fields.values()):
+        # Fall back to the element-by-element lookups
+        method = "xpath"
+        fields = extract_profile_xpath(driver)
+    REGISTRY.observe("bot_extract_seconds", time.perf_counter() - start, method=method)
+    return fields
+
+
+def scrape_profile(driver, target_profile, base_url=INSTAGRAM_URL):
+    """
+    Navigate a logged-in driver to target_profile and extract its bio
+    information into a dict
+    """
+    try:
+        with timer("bot_open_profile_seconds"):
+            open_profile(driver, target_profile, base_url)
+        fields = extract_profile(driver)
+    except Exception as e:
+        incr("bot_profiles_total", result=type(e).__name__)
+        raise
+    incr("bot_profiles_total", result="ok")
+
+    return {
+        "profile": target_profile,
+        "username": fields.get("username"),
+        "bio": fields.get("bio"),
+        "followers": fields.get("followers"),
+        "following": fields.get("following"),
+        "posts_count": fields.get("posts_count"),
+        "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def save_bio(bio_data, output_file="instagram_bio.json"):
+    """
+    Save the extracted data to JSON and print it
+    """
+    with timer("bot_write_seconds"), open(output_file, 'w', encoding='utf-8') as json_file:
+        json.dump(bio_data, json_file, ensure_ascii=False, indent=4)
+
+    print(f"Successfully extracted Instagram bio and saved to {output_file}")
+    print("Extracted data:")
+    print(f"  Profile: {bio_data['profile']}")
+    print(f"  Username: {bio_data['username']}")
+    print(f"  Bio: {bio_data['bio']}")
+    print(f"  Followers: {bio_data['followers']}")
+    print(f"  Following: {bio_data['following']}")
+    print(f"  Posts: {bio_data['posts_count']}")
+
+
+def record_history(snapshots, history_db):
+    """
+    Append snapshots to the history database and print what changed
+    """
+    from instagram_bot.snapshots import SnapshotStore
+
+    store = SnapshotStore(history_db)
+    try:
+        for snapshot in snapshots:
+            changed = store.record(snapshot)
+            for field, (old, new) in changed.items():
+                if old is not None:
+                    print(f"  {snapshot['profile']}: {field} changed from {old!r} to {new!r}")
+    finally:
+        store.close()
+
+
+def scrape_instagram_bio(target_profile=DEFAULT_PROFILE, fast=False, history_db=None):
+    """
+    Instagram bot that:
+    1. Logs in to Instagram
+    2. Navigates to a specific profile (@computacaounifavip_)
+    3. Extracts bio information
+    4. Saves to JSON file
+
+    fast=True runs a headless browser without images, fonts or media;
+    it needs a session saved by an earlier interactive run. history_db
+    also records the snapshot in that SnapshotStore database.
+    """
+    driver = create_driver(fast=fast)
+
+    try:
+        login(driver, interactive=not fast)
+
         # Navigate to the target profile
-        target_profile = "computacaounifavip_"
-        driver.get(f"https://www.instagram.com/{target_profile}/")
-        
-        # Wait for the page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, "//header//section//div//h2"))
-        )
-        
-        # Extract bio information
-        bio = None
-        try:
-            bio_element = driver.find_element(By.XPATH, "//header//section//div//div[2]")
-            bio = bio_element.text
-        except:
-            print("Could not find bio element")
-        
-        # Extract other profile information
-        username = None
-        followers = None
-        following = None
-        posts_count = None
-        
-        try:
-            # Get username
-            username_element = driver.find_element(By.XPATH, "//header//section//div//h2")
-            username = username_element.text
-        except:
-            print("Could not find username")
-        
-        try:
-            # Get followers count
-            followers_element = driver.find_element(By.XPATH, "//header//section//ul//li[2]//a//span")
-            followers = followers_element.get_attribute("title") or followers_element.text
-        except:
-            print("Could not find followers count")
-        
-        try:
-            # Get following count
-            following_element = driver.find_element(By.XPATH, "//header//section//ul//li[3]//a//span")
-            following = following_element.text
-        except:
-            print("Could not find following count")
-        
-        try:
-            # Get posts count
-            posts_element = driver.find_element(By.XPATH, "//header//section//ul//li[1]//span")
-            posts_count = posts_element.text
-        except:
-            print("Could not find posts count")
-        
+        bio_data = scrape_profile(driver, target_profile)
+
         # Save data to JSON
-        bio_data = {
-            "profile": target_profile,
-            "username": username,
-            "bio": bio,
-            "followers": followers,
-            "following": following,
-            "posts_count": posts_count,
-            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        output_file = "instagram_bio.json"
-        with open(output_file, 'w', encoding='utf-8') as json_file:
-            json.dump(bio_data, json_file, ensure_ascii=False, indent=4)
-        
-        print(f"Successfully extracted Instagram bio and saved to {output_file}")
-        print("Extracted data:")
-        print(f"  Profile: {bio_data['profile']}")
-        print(f"  Username: {bio_data['username']}")
-        print(f"  Bio: {bio_data['bio']}")
-        print(f"  Followers: {bio_data['followers']}")
-        print(f"  Following: {bio_data['following']}")
-        print(f"  Posts: {bio_data['posts_count']}")
-        
+        save_bio(bio_data)
+        if history_db:
+            record_history([bio_data], history_db)
+
         return bio_data
-        
+
     except Exception as e:
         print(f"An error occurred: {e}")
         return None
@@ -148,5 +439,39 @@ def scrape_instagram_bio():
         # Close the browser
         driver.quit()
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Instagram profile bios")
+    parser.add_argument("profiles", nargs="*", default=[DEFAULT_PROFILE])
+    parser.add_argument("--fast", action="store_true",
+                        help="headless, no images/fonts/media (needs a saved session)")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--history", metavar="DB", default=None,
+                        help="also record the snapshots in this history database")
+    parser.add_argument("--metrics", metavar="PREFIX", default=None,
+                        help="write phase timings to PREFIX.prom and PREFIX.json")
+    args = parser.parse_args(argv)
+
+    failed = False
+    try:
+        if len(args.profiles) > 1:
+            from instagram_bot.session_pool import scrape_profiles
+
+            results = scrape_profiles(args.profiles, args.pool_size, fast=args.fast)
+            with timer("bot_write_seconds"), open("instagram_bio.json", 'w', encoding='utf-8') as json_file:
+                json.dump(results, json_file, ensure_ascii=False, indent=4)
+            print(f"Scraped {len(results)} profiles and saved to instagram_bio.json")
+            if args.history:
+                record_history(results, args.history)
+            failed = any("error" in result for result in results)
+        else:
+            failed = scrape_instagram_bio(args.profiles[0], fast=args.fast, history_db=args.history) is None
+    finally:
+        if args.metrics:
+            REGISTRY.write(args.metrics)
+    # Non-zero when any profile failed, for cron and scripts
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
-    scrape_instagram_bio()
\ No newline at end of file
+    raise SystemExit(main())
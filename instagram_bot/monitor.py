@@ -0,0 +1,187 @@
+"""
+Adaptive profile monitor
+
+Re-scrapes a set of profiles forever, each on its own interval: a check
+that finds a change shortens the profile's interval, a check that finds
+nothing lengthens it, within [min_interval, max_interval]. A global
+budget caps the checks per hour across all profiles, so browser time
+goes to the profiles that actually change. Every check is recorded in
+a SnapshotStore.
+
+    python -m instagram_bot.monitor perfis.txt --history instagram_history.db --budget 120
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import argparse
+import heapq
+import random
+import threading
+import time
+
+from metrics import REGISTRY
+from instagram_bot.bot import scrape_profile
+from instagram_bot.session_pool import DriverPool, create_restored_driver
+from instagram_bot.snapshots import SnapshotStore
+
+
+class ProfileMonitor:
+    """
+    Polls profiles on adaptive intervals (seconds). After a change the
+    interval is multiplied by shrink, after an unchanged or failed check
+    by grow. budget is the maximum number of checks per hour (None for no
+    cap) and jitter spreads due times by that fraction so profiles do not
+    end up polled in lockstep.
+
+    scrape(profile) defaults to scrape_profile on a DriverPool session.
+    """
+
+    def __init__(self, profiles, store, pool=None, scrape=None, min_interval=300, max_interval=6 * 3600,
+                 budget=120, grow=1.5, shrink=0.5, jitter=0.1):
+        self.store = store
+        self.pool = pool
+        self.scrape = scrape or self._scrape_with_pool
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget = budget
+        self.grow = grow
+        self.shrink = shrink
+        self.jitter = jitter
+        self.workers = pool.size if pool is not None else 1
+
+        self.intervals = {profile: min_interval for profile in profiles}
+        # Start staggered over the first interval instead of all at once
+        now = time.time()
+        self._due = [(now + i * min_interval / max(len(self.intervals), 1), profile)
+                     for i, profile in enumerate(self.intervals)]
+        heapq.heapify(self._due)
+        self._recent = deque()
+        self._stop = threading.Event()
+
+        self.stats = {"checks": 0, "changes": 0, "errors": 0}
+
+    def _scrape_with_pool(self, profile):
+        with self.pool.checkout() as driver:
+            return scrape_profile(driver, profile)
+
+    def _check(self, profile):
+        try:
+            return self.scrape(profile)
+        except Exception as e:
+            return {"profile": profile, "error": str(e)}
+
+    def _budget_wait(self, now):
+        """
+        Seconds until the hourly budget allows another check
+        """
+        while self._recent and self._recent[0] <= now - 3600:
+            self._recent.popleft()
+        if self.budget is None or len(self._recent) < self.budget:
+            return 0
+        return self._recent[0] + 3600 - now
+
+    def _reschedule(self, profile, changed):
+        interval = self.intervals[profile] * (self.shrink if changed else self.grow)
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        self.intervals[profile] = interval
+        spread = random.uniform(1 - self.jitter, 1 + self.jitter)
+        heapq.heappush(self._due, (time.time() + interval * spread, profile))
+
+    def _handle(self, result):
+        profile = result["profile"]
+        self.stats["checks"] += 1
+        REGISTRY.incr("monitor_checks_total")
+        if result.get("error"):
+            self.stats["errors"] += 1
+            print(f"{profile}: {result['error']}")
+            self._reschedule(profile, False)
+            return
+
+        first = self.store.checks(profile) is None
+        changed = self.store.record(result)
+        if changed and not first:
+            self.stats["changes"] += 1
+            REGISTRY.incr("monitor_changes_total")
+            for field, (old, new) in changed.items():
+                print(f"{profile}: {field} changed from {old!r} to {new!r}")
+        self._reschedule(profile, bool(changed) and not first)
+
+    def run(self, duration=None):
+        """
+        Poll until stop() is called or duration seconds have passed;
+        returns the stats
+        """
+        deadline = None if duration is None else time.time() + duration
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set():
+                now = time.time()
+                if deadline is not None and now >= deadline:
+                    break
+
+                # Start every due check the workers and the budget allow
+                delay = self._due[0][0] - now if self._due else 1.0
+                while self._due and len(in_flight) < self.workers and self._due[0][0] <= now:
+                    budget_wait = self._budget_wait(now)
+                    if budget_wait > 0:
+                        delay = budget_wait
+                        break
+                    _, profile = heapq.heappop(self._due)
+                    self._recent.append(now)
+                    in_flight.add(executor.submit(self._check, profile))
+                    delay = self._due[0][0] - now if self._due else 1.0
+
+                timeout = max(0.05, min(delay, 1.0))
+                if deadline is not None:
+                    timeout = min(timeout, max(deadline - now, 0.05))
+                if in_flight:
+                    done, in_flight = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._handle(future.result())
+                else:
+                    self._stop.wait(timeout)
+
+            for future in in_flight:
+                self._handle(future.result())
+        return self.stats
+
+    def stop(self):
+        self._stop.set()
+
+
+def main(argv=None):
+    from instagram_bot.batch import read_profiles
+
+    parser = argparse.ArgumentParser(description="Monitor Instagram profiles on adaptive intervals")
+    parser.add_argument("profiles_file", help="file with one profile handle per line")
+    parser.add_argument("--history", metavar="DB", default="instagram_history.db")
+    parser.add_argument("--min-interval", type=float, default=300, help="seconds")
+    parser.add_argument("--max-interval", type=float, default=6 * 3600, help="seconds")
+    parser.add_argument("--budget", type=int, default=120, help="maximum profile checks per hour")
+    parser.add_argument("--pool-size", type=int, default=1, help="browser sessions")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--metrics", metavar="PREFIX", default=None,
+                        help="write phase timings to PREFIX.prom and PREFIX.json on exit")
+    parser.add_argument("--no-fast", dest="fast", action="store_false",
+                        help="load full pages with a visible browser")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.history)
+    # Nobody is at the console during a long run, so sessions are only restored
+    pool = DriverPool(args.pool_size, factory=lambda: create_restored_driver(args.fast))
+    monitor = ProfileMonitor(read_profiles(args.profiles_file), store, pool,
+                             min_interval=args.min_interval, max_interval=args.max_interval,
+                             budget=args.budget)
+    try:
+        stats = monitor.run(args.duration)
+    except KeyboardInterrupt:
+        stats = monitor.stats
+    finally:
+        pool.close()
+        store.close()
+        if args.metrics:
+            REGISTRY.write(args.metrics)
+    print(f"{stats['checks']} checks, {stats['changes']} with changes, {stats['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
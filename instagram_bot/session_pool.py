@@ -0,0 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import queue
+import threading
+
+from instagram_bot.bot import SessionExpiredError, create_driver, login, scrape_profile
+
+
+def create_logged_in_driver(fast=False):
+    """
+    Default session factory: a new browser that went through login.
+    Headless fast-mode browsers only restore the saved session.
+    """
+    driver = create_driver(fast=fast)
+    try:
+        login(driver, interactive=not fast)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def create_restored_driver(fast=True):
+    """
+    Session factory for unattended runs: a new browser on the saved
+    session, never prompting for a login. Raises SessionExpiredError
+    when the session is missing or expired.
+    """
+    driver = create_driver(fast=fast)
+    try:
+        login(driver, interactive=False)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+class DriverPool:
+    """
+    Pool of warm, logged-in browser sessions.
+
+    Sessions are created lazily, one at a time (login may need the user at
+    the console), up to size. checkout() hands out an idle session and
+    takes it back afterwards; a session whose browser died or got logged
+    out is discarded and replaced on the next checkout.
+    """
+
+    def __init__(self, size=2, factory=create_logged_in_driver):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.Queue()
+        self._created = 0
+        self._drivers = []
+        self._lock = threading.Lock()
+        self._create_lock = threading.Lock()
+
+    def _reserve(self):
+        """
+        Claim a slot for a new session, False if the pool is full
+        """
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _create(self):
+        try:
+            with self._create_lock:
+                driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._reserve():
+                return self._create()
+            # Wake up now and then in case a dead session freed its slot
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _discard(self, driver):
+        with self._lock:
+            self._created -= 1
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def warm(self):
+        """
+        Start every remaining session up front instead of on first use
+        """
+        while self._reserve():
+            self._idle.put(self._create())
+
+    @contextmanager
+    def checkout(self):
+        driver = self._acquire()
+        try:
+            yield driver
+        except SessionExpiredError:
+            self._discard(driver)
+            raise
+        except BaseException:
+            # Includes the urllib3 errors raised once chromedriver itself is gone
+            if self._is_alive(driver):
+                self._idle.put(driver)
+            else:
+                self._discard(driver)
+            raise
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+            self._created = 0
+            self._idle = queue.Queue()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scrape_profiles(profiles, pool_size=2, pool=None, fast=False):
+    """
+    Scrape a list of profiles, reusing pool_size logged-in sessions across
+    all of them. Returns one dict per profile, in input order; a profile
+    that failed gets an "error" key instead of data.
+    """
+    own_pool = pool is None
+    pool = pool or DriverPool(pool_size, factory=lambda: create_logged_in_driver(fast))
+
+    def work(profile):
+        try:
+            with pool.checkout() as driver:
+                return scrape_profile(driver, profile)
+        except Exception as e:
+            print(f"Failed to scrape {profile}: {e}")
+            return {"profile": profile, "error": str(e)}
+
+    try:
+        pool.warm()
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            return list(executor.map(work, profiles))
+    finally:
+        if own_pool:
+            pool.close()
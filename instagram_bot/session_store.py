@@ -0,0 +1,87 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+import json
+import os
+import time
+
+COOKIES_FILE = ".cache/instagram_bot/cookies.json"
+
+# Cookie that carries the authenticated Instagram session
+SESSION_COOKIE = "sessionid"
+
+COOKIE_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "expiry")
+
+# Navigation icon that only shows up for a logged-in user
+LOGGED_IN_XPATH = "//*[local-name()='svg' and @aria-label='Home']"
+
+
+def save_cookies(driver, path=COOKIES_FILE):
+    """
+    Save the browser's cookie jar so later runs can skip the login
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    cookies = [{key: cookie[key] for key in COOKIE_KEYS if key in cookie}
+               for cookie in driver.get_cookies()]
+    with open(path, 'w', encoding='utf-8') as cookies_file:
+        json.dump(cookies, cookies_file)
+    # The session cookie is as good as a password
+    os.chmod(path, 0o600)
+
+
+def load_cookies(path=COOKIES_FILE):
+    """
+    Load saved cookies, or None when there are none or the session cookie
+    is missing or expired. This check is local, no page is loaded.
+    """
+    try:
+        with open(path, encoding='utf-8') as cookies_file:
+            cookies = json.load(cookies_file)
+    except (OSError, ValueError):
+        return None
+
+    now = time.time()
+    for cookie in cookies:
+        if cookie.get("name") == SESSION_COOKIE:
+            expiry = cookie.get("expiry")
+            return cookies if expiry is None or expiry > now else None
+    return None
+
+
+def restore_session(driver, base_url, path=COOKIES_FILE, timeout=10):
+    """
+    Put the saved cookies into the browser and check that base_url now
+    shows a logged-in page (no login form). Returns True on success.
+    """
+    cookies = load_cookies(path)
+    if cookies is None:
+        return False
+
+    # Cookies can only be set for the domain currently loaded
+    driver.get(base_url)
+    for cookie in cookies:
+        if "expiry" in cookie:
+            cookie["expiry"] = int(cookie["expiry"])
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            pass
+
+    driver.get(base_url)
+    try:
+        # Whichever renders first: the login form or the logged-in navigation
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.find_elements(By.NAME, "username") or d.find_elements(By.XPATH, LOGGED_IN_XPATH)
+        )
+    except TimeoutException:
+        return False
+    return not driver.find_elements(By.NAME, "username")
+
+
+def clear_session(path=COOKIES_FILE):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
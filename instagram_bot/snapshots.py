@@ -0,0 +1,217 @@
+"""
+Time-series store for profile snapshots
+
+Every scrape of a profile is compared with the last known state and
+only the fields that changed (follower counts, bio edits, ...) are
+appended, so monitoring many profiles for months stays compact. Changes
+are indexed by profile, field and time, which keeps queries like "the
+follower history of X" to an index range scan.
+
+    python -m instagram_bot.snapshots instagram_history.db computacaounifavip_ --field followers
+"""
+import argparse
+import os
+import re
+import sqlite3
+import time
+
+FIELDS = ("username", "bio", "followers", "following", "posts_count")
+
+# Fields that hold counts and get a numeric column for history queries
+COUNT_FIELDS = ("followers", "following", "posts_count")
+
+_SUFFIXES = {"k": 1_000, "mil": 1_000, "m": 1_000_000, "mi": 1_000_000, "b": 1_000_000_000}
+
+
+def parse_count(text):
+    """
+    Turn a displayed count ('1,234', '12.5k', '1,2 mi', '3M') into an int,
+    None if it cannot be read
+    """
+    if text is None:
+        return None
+    match = re.match(r"^\s*([\d.,]+)\s*([a-zA-Z]*)", str(text))
+    if not match:
+        return None
+    number, suffix = match.group(1), match.group(2).lower()
+    multiplier = _SUFFIXES.get(suffix, 1)
+    if multiplier == 1:
+        digits = re.sub(r"[.,]", "", number)
+        return int(digits) if digits else None
+    # With a suffix the separator is a decimal point, in either locale
+    try:
+        return int(float(number.replace(",", ".")) * multiplier)
+    except ValueError:
+        return None
+
+
+def _timestamp(snapshot):
+    scraped_at = snapshot.get("scraped_at")
+    if scraped_at:
+        try:
+            return time.mktime(time.strptime(scraped_at, "%Y-%m-%d %H:%M:%S"))
+        except ValueError:
+            pass
+    return time.time()
+
+
+class SnapshotStore:
+    """
+    Append-only store of profile field changes, in sqlite
+    """
+
+    def __init__(self, path="instagram_history.db"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS changes ("
+                " id INTEGER PRIMARY KEY,"
+                " profile TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value TEXT,"
+                " number INTEGER,"
+                " observed_at REAL NOT NULL"
+                ")"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_changes_profile_field_time"
+                " ON changes (profile, field, observed_at)"
+            )
+            # Current value of every field, to compute deltas without scanning history
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS current ("
+                " profile TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value TEXT,"
+                " PRIMARY KEY (profile, field)"
+                ") WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS checks ("
+                " profile TEXT PRIMARY KEY,"
+                " first_seen REAL NOT NULL,"
+                " last_checked REAL NOT NULL,"
+                " last_changed REAL,"
+                " check_count INTEGER NOT NULL"
+                ")"
+            )
+
+    def record(self, snapshot):
+        """
+        Record a scraped snapshot and return the fields that changed as
+        {field: (old, new)}; the first snapshot of a profile counts as a
+        change of every field. Failed scrapes (with an "error") are ignored.
+        """
+        if snapshot.get("error") or not snapshot.get("profile"):
+            return {}
+
+        profile = snapshot["profile"]
+        observed_at = _timestamp(snapshot)
+        current = dict(self.conn.execute(
+            "SELECT field, value FROM current WHERE profile = ?", (profile,)
+        ))
+
+        changed = {}
+        for field in FIELDS:
+            if field not in snapshot:
+                continue
+            value = snapshot[field]
+            value = None if value is None else str(value)
+            if field in current and current[field] == value:
+                continue
+            changed[field] = (current.get(field), value)
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO changes (profile, field, value, number, observed_at) VALUES (?, ?, ?, ?, ?)",
+                [(profile, field, new, parse_count(new) if field in COUNT_FIELDS else None, observed_at)
+                 for field, (_, new) in changed.items()]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO current (profile, field, value) VALUES (?, ?, ?)",
+                [(profile, field, new) for field, (_, new) in changed.items()]
+            )
+            self.conn.execute(
+                "INSERT INTO checks (profile, first_seen, last_checked, last_changed, check_count)"
+                " VALUES (?, ?, ?, ?, 1)"
+                " ON CONFLICT(profile) DO UPDATE SET"
+                " last_checked = excluded.last_checked,"
+                " last_changed = COALESCE(excluded.last_changed, last_changed),"
+                " check_count = check_count + 1",
+                (profile, observed_at, observed_at, observed_at if changed else None)
+            )
+        return changed
+
+    def latest(self, profile):
+        """
+        Current known state of a profile, None if it was never recorded
+        """
+        rows = self.conn.execute("SELECT field, value FROM current WHERE profile = ?", (profile,)).fetchall()
+        if not rows:
+            return None
+        state = {"profile": profile}
+        state.update(rows)
+        return state
+
+    def history(self, profile, field, since=None, until=None):
+        """
+        [(observed_at, value)] of every change of a field, oldest first
+        """
+        rows = self.conn.execute(
+            "SELECT observed_at, value, number FROM changes"
+            " WHERE profile = ? AND field = ? AND observed_at BETWEEN ? AND ?"
+            " ORDER BY observed_at",
+            (profile, field, since or 0, until or float("inf"))
+        )
+        if field in COUNT_FIELDS:
+            return [(observed_at, number) for observed_at, _, number in rows]
+        return [(observed_at, value) for observed_at, value, _ in rows]
+
+    def follower_history(self, profile, since=None, until=None):
+        return self.history(profile, "followers", since, until)
+
+    def checks(self, profile):
+        """
+        Bookkeeping for a profile: first_seen, last_checked, last_changed
+        and check_count, None if never recorded
+        """
+        row = self.conn.execute(
+            "SELECT first_seen, last_checked, last_changed, check_count FROM checks WHERE profile = ?",
+            (profile,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("first_seen", "last_checked", "last_changed", "check_count"), row))
+
+    def profiles(self):
+        return [row[0] for row in self.conn.execute("SELECT profile FROM checks ORDER BY profile")]
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the recorded history of an Instagram profile")
+    parser.add_argument("database")
+    parser.add_argument("profile", nargs="?", help="omit to list the recorded profiles")
+    parser.add_argument("--field", default="followers", choices=FIELDS)
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.database)
+    try:
+        if args.profile is None:
+            for profile in store.profiles():
+                print(profile)
+            return
+        for observed_at, value in store.history(args.profile, args.field):
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(observed_at))}  {value}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Local Instagram stand-in
+
+Serves static login, home and profile pages with the same DOM structure
+the bot's XPaths target, so the bot can be exercised and tuned offline.
+Response latency, client-side render delay and the post-login dialogs
+are configurable, and --drift makes follower counts change between
+visits to exercise change detection. Any username/password logs in.
+
+    python -m instagram_bot.standin_server --port 8000 --dialogs 2 --render-delay 0.3
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+import argparse
+import hashlib
+import html
+import secrets
+import threading
+import time
+
+SESSION_COOKIE = "sessionid"
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<main id="root"></main>
+<template id="content">{content}</template>
+<script>
+setTimeout(function () {{
+    var root = document.getElementById("root");
+    root.appendChild(document.getElementById("content").content.cloneNode(true));
+}}, {render_delay_ms});
+</script>
+</body>
+</html>
+"""
+
+LOGIN_FORM = """
+<form method="post" action="/accounts/login/">
+    <input name="username" type="text" placeholder="Phone number, username, or email">
+    <input name="password" type="password" placeholder="Password">
+    <button type="submit">Log in</button>
+</form>
+"""
+
+# Dismissing a dialog removes it; the last one leads to the home page
+DIALOG = """
+<div role="dialog" id="dialog">
+    <span>{text}</span>
+    <button type="button" onclick="{action}">Not Now</button>
+</div>
+"""
+
+DIALOG_TEXTS = ["Save your login info?", "Turn on Notifications"]
+
+HOME = """
+<nav><a href="/"><svg aria-label="Home" role="img" width="24" height="24"></svg></a></nav>
+<section><p>Feed</p></section>
+"""
+
+PROFILE = """
+<header>
+    <section>
+        <div class="profile-info">
+            <div class="profile-name"><h2>{username}</h2></div>
+            <div class="profile-bio">{bio}</div>
+        </div>
+        <ul>
+            <li><span>{posts}</span> posts</li>
+            <li><a href="/{handle}/followers/"><span title="{followers}">{followers}</span> followers</a></li>
+            <li><a href="/{handle}/following/"><span>{following}</span> following</a></li>
+        </ul>
+    </section>
+</header>
+"""
+
+
+def fake_profile(handle, drift=0):
+    """
+    Deterministic profile data for a handle; drift shifts the follower
+    count so repeated scrapes can observe changes
+    """
+    seed = int(hashlib.sha1(handle.encode('utf-8')).hexdigest(), 16)
+    return {
+        "handle": handle,
+        "username": handle.replace("_", " ").title(),
+        "bio": f"Perfil de teste de {handle}",
+        "posts": seed % 500,
+        "followers": seed % 100000 + drift,
+        "following": seed % 1000
+    }
+
+
+class StandinServer:
+    """
+    Threaded stand-in server. latency delays every response (seconds),
+    render_delay delays the client-side rendering of the page content,
+    dialogs is how many 'Not Now' dialogs follow a login (0 to 2), and
+    profile_dialog shows a dialog on top of profile pages as well.
+    drift is added to a generated profile's follower count on every
+    visit after the first. profiles can override the generated data for
+    given handles.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, render_delay=0.0, dialogs=2,
+                 profile_dialog=False, profiles=None, drift=0):
+        self.latency = latency
+        self.render_delay = render_delay
+        self.dialogs = dialogs
+        self.profile_dialog = profile_dialog
+        self.profiles = dict(profiles or {})
+        self.drift = drift
+        self.visits = {}
+        self.sessions = set()
+        self.hits = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self, "GET")
+
+            def do_POST(self):
+                server.handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}/"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    # Rendering
+
+    def page(self, title, content):
+        return PAGE.format(title=html.escape(title), content=content,
+                           render_delay_ms=int(self.render_delay * 1000))
+
+    def dialog(self, index):
+        last = index + 1 >= self.dialogs
+        action = ("location.href='/'" if last
+                  else f"location.href='/accounts/onetap/?step={index + 1}'")
+        return DIALOG.format(text=DIALOG_TEXTS[index % len(DIALOG_TEXTS)], action=action)
+
+    def profile(self, handle):
+        with self._lock:
+            visits = self.visits.get(handle, 0)
+            self.visits[handle] = visits + 1
+        data = self.profiles.get(handle) or fake_profile(handle, self.drift * visits)
+        content = PROFILE.format(**{key: html.escape(str(value)) for key, value in data.items()})
+        if self.profile_dialog:
+            content = DIALOG.format(
+                text=DIALOG_TEXTS[1], action="document.getElementById('dialog').remove()"
+            ) + content
+        return self.page(f"@{handle}", content)
+
+    # Request handling
+
+    def logged_in(self, request):
+        cookie = SimpleCookie(request.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value in self.sessions
+
+    def handle(self, request, method):
+        with self._lock:
+            self.hits += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = request.path.split("?", 1)[0]
+        query = parse_qs(request.path.split("?", 1)[1]) if "?" in request.path else {}
+        headers = {}
+
+        if method == "POST" and path == "/accounts/login/":
+            length = int(request.headers.get("Content-Length", 0))
+            form = parse_qs(request.rfile.read(length).decode('utf-8'))
+            if not form.get("username") or not form.get("password"):
+                return self.respond(request, 303, "", {"Location": "/"})
+            token = secrets.token_hex(16)
+            with self._lock:
+                self.sessions.add(token)
+            headers["Set-Cookie"] = f"{SESSION_COOKIE}={token}; Path=/; Max-Age=31536000; HttpOnly"
+            headers["Location"] = "/accounts/onetap/?step=0" if self.dialogs else "/"
+            return self.respond(request, 303, "", headers)
+
+        if not self.logged_in(request):
+            return self.respond(request, 200, self.page("Login", LOGIN_FORM))
+
+        if path == "/accounts/onetap/":
+            step = int(query.get("step", ["0"])[0])
+            if step < self.dialogs:
+                return self.respond(request, 200, self.page("Instagram", self.dialog(step)))
+            path = "/"
+
+        if path == "/":
+            return self.respond(request, 200, self.page("Instagram", HOME))
+
+        handle = path.strip("/").split("/")[0]
+        if handle:
+            return self.respond(request, 200, self.profile(handle))
+        return self.respond(request, 404, self.page("Not found", "<p>Page not found</p>"))
+
+    @staticmethod
+    def respond(request, status, body, headers=None):
+        data = body.encode('utf-8')
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(data)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local Instagram stand-in")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--render-delay", type=float, default=0.0,
+                        help="seconds before the page content is rendered client-side")
+    parser.add_argument("--dialogs", type=int, default=2, choices=[0, 1, 2])
+    parser.add_argument("--profile-dialog", action="store_true")
+    parser.add_argument("--drift", type=int, default=0,
+                        help="followers added to a profile on every visit after the first")
+    args = parser.parse_args(argv)
+
+    server = StandinServer(port=args.port, latency=args.latency, render_delay=args.render_delay,
+                           dialogs=args.dialogs, profile_dialog=args.profile_dialog, drift=args.drift)
+    print(f"Instagram stand-in listening on {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
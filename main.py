@@ -1,5 +1,26 @@
-import os
+import argparse
+import importlib
 import sys
+import time
+
+# Subcommands for non-interactive use: name -> (module with main(argv), description).
+# Modules are only imported for the command that runs, so bs4/selenium are
+# not loaded unless needed.
+COMMANDS = {
+    'news': ('news_scraper.scraper', 'Projeto I - Scraper de Notícias'),
+    'search': ('news_scraper.search_index', 'Busca por palavras nas manchetes'),
+    'instagram': ('instagram_bot.bot', 'Projeto II - Scraper de Bio Instagram'),
+    'instagram-batch': ('instagram_bot.batch', 'Raspagem de perfis em lote'),
+    'monitor': ('instagram_bot.monitor', 'Monitoramento adaptativo de perfis'),
+    'history': ('instagram_bot.snapshots', 'Histórico de perfis'),
+    'daemon': ('daemon', 'Executa os scrapers periodicamente'),
+}
+
+BENCHMARKS = {
+    'news': 'news_scraper.benchmark',
+    'parse': 'news_scraper.bench_parse',
+    'instagram': 'instagram_bot.benchmark',
+}
 
 def print_menu():
     # Display the main menu
@@ -42,8 +63,63 @@ def run_instagram_bot():
     except Exception as e:
         print(f'Ocorreu um erro ao executar o bot do Instagram: {e}')
 
-def main():
-    # Main function to run the menu
+def import_command(module_name, profile_startup=False):
+    # Import the module behind a command, optionally reporting how long it took
+    already_loaded = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if profile_startup:
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f'Importação de {module_name}: {elapsed:.1f} ms '
+              f'({len(sys.modules) - already_loaded} módulos carregados)', file=sys.stderr)
+    return module
+
+def run_command(argv):
+    # Run a subcommand without the menu; returns the exit code
+    parser = argparse.ArgumentParser(
+        description='Executa os projetos sem o menu interativo',
+        epilog='Use "<comando> --help" para ver as opções de cada comando.'
+    )
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='mostra o tempo de importação do comando em stderr')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    # Options after the command name are handed to the project's own parser
+    for name, (_, description) in COMMANDS.items():
+        subparsers.add_parser(name, help=description, add_help=False)
+    bench = subparsers.add_parser('bench', help='Benchmarks', add_help=False)
+    bench.add_argument('target', choices=sorted(BENCHMARKS))
+    args, command_args = parser.parse_known_args(argv)
+
+    if args.command == 'bench':
+        module_name = BENCHMARKS[args.target]
+    else:
+        module_name = COMMANDS[args.command][0]
+
+    try:
+        module = import_command(module_name, args.profile_startup)
+    except ImportError as e:
+        print(f'Erro ao importar {module_name}: {e}', file=sys.stderr)
+        print('Certifique-se de que as dependências estão instaladas: pip install -r requirements.txt',
+              file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        # Commands return their exit status, or None when they cannot fail
+        status = module.main(command_args)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if args.profile_startup:
+            print(f'Tempo total do comando: {time.perf_counter() - start:.2f} s', file=sys.stderr)
+    return status or 0
+
+def main(argv=None):
+    # With arguments run a single command, otherwise show the menu
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_command(argv))
+
     while True:
         print_menu()
         choice = input('\nEscolha uma opção (1-3): ').strip()
@@ -0,0 +1,185 @@
+"""
+Lightweight instrumentation shared by both scrapers
+
+Counters and histograms kept in memory, keyed by name and labels, with
+a timer context manager for phases (fetch, parse, wait, extract,
+write). REGISTRY collects everything a process records. It can be
+exported as Prometheus text exposition format or as a JSON summary with
+percentiles:
+
+    from metrics import REGISTRY, timer
+
+    with timer("news_parse_seconds", site="books"):
+        items = plan.extract(body, url)
+
+    REGISTRY.write("metrics")   # metrics.prom and metrics.json
+"""
+from collections import deque
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the histogram buckets, Prometheus defaults plus slow browser waits
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Recent samples kept per histogram for the percentiles in the JSON summary
+SAMPLE_SIZE = 1000
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum", "max", "samples")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def percentile(fraction):
+            return round(ordered[int(round(fraction * (len(ordered) - 1)))], 6) if ordered else None
+
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(self.max, 6)
+        }
+
+
+def _key(name, labels):
+    # Values are exported as text anyway, and keys with mixed int/str
+    # values (status=200 vs status="Timeout") would not sort
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and histograms
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Observe the seconds spent in the block, also when it raises
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, histogram.summary()) for key, histogram in self._histograms.items())
+        return {
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in counters],
+            "histograms": [dict(name=name, labels=dict(labels), **summary)
+                           for (name, labels), summary in histograms]
+        }
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda entry: entry[0])
+            typed = set()
+            for (name, labels), value in counters:
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{_label_text(labels)} {value}")
+            for (name, labels), histogram in histograms:
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_label_text(labels, [('le', repr(bound))])} {cumulative}")
+                lines.append(f"{name}_bucket{_label_text(labels, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{name}_sum{_label_text(labels)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{_label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix):
+        """
+        Write prefix.prom (Prometheus text format) and prefix.json, each
+        atomically so a collector never reads a half-written file
+        """
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for suffix, data in ((".prom", self.to_prometheus()),
+                             (".json", json.dumps(self.to_dict(), indent=2) + "\n")):
+            temporary = prefix + suffix + ".tmp"
+            with open(temporary, 'w', encoding='utf-8') as metrics_file:
+                metrics_file.write(data)
+            os.replace(temporary, prefix + suffix)
+
+
+REGISTRY = Metrics()
+
+
+def incr(name, value=1, **labels):
+    REGISTRY.incr(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    REGISTRY.observe(name, value, **labels)
+
+
+def timer(name, **labels):
+    return REGISTRY.timer(name, **labels)
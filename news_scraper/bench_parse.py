@@ -0,0 +1,60 @@
+"""
+Micro-benchmark for listing page extraction
+
+Parses saved listing pages with every available parser backend, building
+either the full tree or only the product cards, and reports items/sec.
+
+    python -m news_scraper.bench_parse [page.html ...] [--repeat N]
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import time
+
+from news_scraper.scraper import parse_listing
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+PAGE_URL = "http://books.toscrape.com/catalogue/page-2.html"
+
+
+def available_backends():
+    backends = ['html.parser']
+    if importlib.util.find_spec('lxml'):
+        backends.append('lxml')
+    return backends
+
+
+def bench(pages, backend, restricted, repeat):
+    items = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            items += len(parse_listing(html, PAGE_URL, backend=backend, restricted=restricted))
+    elapsed = time.perf_counter() - start
+    return items, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare listing extraction speed between parser backends")
+    parser.add_argument("pages", nargs="*", help="saved listing pages (defaults to the bundled catalogue fixtures)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    paths = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, "catalogue_*.html")))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as page_file:
+            pages.append(page_file.read())
+
+    print(f"{len(pages)} page(s) x {args.repeat} repetitions")
+    print(f"{'backend':<12} {'mode':<11} {'items':>8} {'seconds':>9} {'items/sec':>11}")
+    for backend in available_backends():
+        for restricted in (False, True):
+            items, elapsed = bench(pages, backend, restricted, args.repeat)
+            mode = "restricted" if restricted else "full tree"
+            print(f"{backend:<12} {mode:<11} {items:>8} {elapsed:>9.3f} {items / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
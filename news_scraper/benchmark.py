@@ -0,0 +1,218 @@
+"""
+Offline benchmark suite for the news scraper
+
+Serves the recorded pages in fixtures/ from a local HTTP server (with a
+configurable page count and per-request latency), runs scrape_news() in
+each of its modes against it and prints a JSON report with pages/sec,
+items/sec, p50/p99 fetch latency and peak traced memory per mode.
+
+    python -m news_scraper.benchmark --pages 50 --latency 0.05 --output bench.json
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from news_scraper.scraper import create_session, scrape_news
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+PRODUCT_HREF_RE = re.compile(r'href="([^"/]+)_(\d+)/index\.html"')
+CURRENT_PAGE_RE = re.compile(r"Page\s+\d+\s+of\s+\d+")
+LISTING_PATH_RE = re.compile(r"^/catalogue/page-(\d+)\.html$")
+
+MODES = ["front", "serial", "crawl", "crawl-jsonl", "crawl-cache", "crawl-enrich", "crawl-procs"]
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as fixture:
+        return fixture.read()
+
+
+class FixtureServer:
+    """
+    Local HTTP server that mimics the Books to Scrape catalogue from the
+    recorded fixtures: the front page, page_count listing pages with
+    unique product links, and a detail page for every product. Every
+    response is delayed by latency seconds and carries an ETag, so
+    conditional requests get 304 answers.
+    """
+
+    def __init__(self, page_count=50, latency=0.0):
+        self.page_count = page_count
+        self.latency = latency
+        self._listing = _read_fixture("catalogue_page.html")
+        self._product = _read_fixture("product_page.html").encode('utf-8')
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                body = server.render(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def listing(self, page, front=False):
+        prefix = "catalogue/" if front else ""
+        html = PRODUCT_HREF_RE.sub(
+            lambda m: f'href="{prefix}{m.group(1)}_{page}{m.group(2)}/index.html"', self._listing
+        )
+        html = CURRENT_PAGE_RE.sub(f"Page {page} of {self.page_count}", html)
+        return html.encode('utf-8')
+
+    def render(self, path):
+        if path in ("/", "/index.html"):
+            return self.listing(1, front=True)
+        match = LISTING_PATH_RE.match(path)
+        if match:
+            page = int(match.group(1))
+            return self.listing(page) if 1 <= page <= self.page_count else None
+        if path.startswith("/catalogue/") and path.endswith("/index.html"):
+            return self._product
+        return None
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def run_mode(mode, server, workdir, max_in_flight):
+    """
+    Run scrape_news in the given mode and return its measurements
+    """
+    latencies = []
+    session = create_session(max_in_flight * 2)
+    session.hooks["response"].append(
+        lambda response, *args, **kwargs: latencies.append(response.elapsed.total_seconds())
+    )
+
+    kwargs = {"base_url": server.base_url, "session": session,
+              "output_file": os.path.join(workdir, f"{mode}.json")}
+    if mode != "front":
+        kwargs["crawl"] = True
+        kwargs["max_in_flight"] = 1 if mode == "serial" else max_in_flight
+    if mode == "crawl-jsonl":
+        kwargs["output_format"] = "jsonl"
+    if mode == "crawl-enrich":
+        kwargs.update(enrich=True, enrich_rate=1000.0, per_host=max_in_flight)
+    if mode == "crawl-procs":
+        # Parsing in one worker process per core; memory of the workers is not traced
+        kwargs["parse_workers"] = None
+    if mode == "crawl-cache":
+        # Warm the cache first; only the revalidating run is measured
+        kwargs["cache_dir"] = os.path.join(workdir, "cache")
+        with contextlib.redirect_stdout(io.StringIO()):
+            scrape_news(**kwargs)
+        latencies.clear()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = scrape_news(**kwargs)
+    elapsed = time.perf_counter() - start
+    fetch_latencies = list(latencies)
+
+    # Memory is traced in a second identical run, tracing slows the first one down too much
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scrape_news(**kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    items = result if isinstance(result, int) else len(result)
+    pages = 1 if mode == "front" else server.page_count
+    return {
+        "mode": mode,
+        "pages": pages,
+        "items": items,
+        "requests": len(fetch_latencies),
+        "seconds": round(elapsed, 4),
+        "pages_per_sec": round(pages / elapsed, 2),
+        "items_per_sec": round(items / elapsed, 2),
+        "fetch_latency_p50_ms": _ms(percentile(fetch_latencies, 0.50)),
+        "fetch_latency_p99_ms": _ms(percentile(fetch_latencies, 0.99)),
+        "peak_memory_bytes": peak
+    }
+
+
+def run_benchmark(modes=MODES, page_count=50, latency=0.0, max_in_flight=8):
+    report = {
+        "config": {"pages": page_count, "latency": latency, "max_in_flight": max_in_flight},
+        "results": []
+    }
+    with FixtureServer(page_count, latency) as server, tempfile.TemporaryDirectory() as workdir:
+        for mode in modes:
+            report["results"].append(run_mode(mode, server, workdir, max_in_flight))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scrape_news against a local fixture server")
+    parser.add_argument("--pages", type=int, default=50, help="number of listing pages to serve")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.modes, args.pages, args.latency, args.max_in_flight)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(data + "\n")
+    print(data)
+
+
+if __name__ == "__main__":
+    main()
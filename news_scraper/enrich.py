@@ -0,0 +1,121 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from urllib.parse import urlparse
+import threading
+import time
+
+import requests
+
+# The detail page keeps the description in the <p> right after #product_description
+PRODUCT_PAGE_STRAINER = SoupStrainer('article', class_='product_page')
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows rate requests per second on average,
+    with bursts of up to burst requests
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available and take it
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_description(html, backend='html.parser'):
+    """
+    Extract the product description from a detail page, None if missing
+    """
+    soup = BeautifulSoup(html, backend, parse_only=PRODUCT_PAGE_STRAINER)
+    header = soup.find(id='product_description')
+    paragraph = header.find_next_sibling('p') if header else None
+    return paragraph.get_text(strip=True) if paragraph else None
+
+
+class Enricher:
+    """
+    Fetches item detail pages concurrently and replaces the listing
+    summary with the real description.
+
+    Requests are paced by a global token bucket and at most per_host of
+    them are in flight against the same host. fetch(url) must return the
+    raw body of url.
+    """
+
+    def __init__(self, fetch, rate=5.0, burst=None, per_host=4, max_workers=8, backend='html.parser'):
+        self.fetch = fetch
+        self.bucket = TokenBucket(rate, burst)
+        self.per_host = per_host
+        self.max_workers = max_workers
+        self.backend = backend
+        self.failures = 0
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._lock = threading.Lock()
+
+    def _slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            return self._host_slots[host]
+
+    def enrich(self, item):
+        link = item.get("link") or ""
+        if not link.startswith(("http://", "https://")):
+            return item
+
+        with self._slot(link):
+            self.bucket.acquire()
+            try:
+                body = self.fetch(link)
+            except requests.exceptions.RequestException:
+                with self._lock:
+                    self.failures += 1
+                return item
+
+        description = parse_description(body, self.backend)
+        if description:
+            item["summary"] = description
+        return item
+
+    def enrich_stream(self, items):
+        """
+        Enrich items from an iterable, yielding them in their original order
+        while keeping at most max_workers detail requests outstanding
+        """
+        items = iter(items)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for item in items:
+                    pending.append(executor.submit(self.enrich, item))
+                    if len(pending) >= self.max_workers:
+                        break
+
+                while pending:
+                    yield pending.popleft().result()
+                    next_item = next(items, None)
+                    if next_item is not None:
+                        pending.append(executor.submit(self.enrich, next_item))
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,139 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import deque
+import random
+import threading
+import time
+
+import requests
+
+from metrics import REGISTRY, incr
+
+# Answers worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Latency samples needed before the adaptive hedge threshold kicks in
+MIN_HEDGE_SAMPLES = 20
+
+
+class Fetcher:
+    """
+    Fetch layer over a requests session with per-request timeouts,
+    exponential backoff retries and optional hedged requests.
+
+    When hedge_after is a number of seconds (or "auto" for the p95 of the
+    recent latencies), a duplicate request is sent if the first one has
+    not answered by then and whichever finishes first wins. get() has the
+    same shape as Session.get, so a Fetcher can be used wherever the
+    scraper expects a session. Counters are available from stats().
+    """
+
+    def __init__(self, session, timeout=10.0, retries=3, backoff=0.5, hedge_after=None,
+                 max_workers=16):
+        self.session = session
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self._latencies = deque(maxlen=500)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if hedge_after else None
+        self.metrics = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "hedges_sent": 0,
+            "hedges_won": 0
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.metrics[name] += 1
+
+    def _hedge_delay(self):
+        if self.hedge_after != "auto":
+            return self.hedge_after
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _request(self, url, headers):
+        self._count("requests")
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            REGISTRY.observe("news_fetch_seconds", time.monotonic() - start, status=type(e).__name__)
+            raise
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self._latencies.append(elapsed)
+        REGISTRY.observe("news_fetch_seconds", elapsed, status=str(response.status_code))
+        return response
+
+    def _hedged_request(self, url, headers):
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._request(url, headers)
+
+        primary = self._executor.submit(self._request, url, headers)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count("hedges_sent")
+        incr("news_hedges_sent_total")
+        hedge = self._executor.submit(self._request, url, headers)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    continue
+                if future is hedge:
+                    self._count("hedges_won")
+                    incr("news_hedges_won_total")
+                # The loser is left to finish in the background
+                return response
+        raise error
+
+    def get(self, url, headers=None):
+        """
+        GET url, retrying connection errors, timeouts and 429/5xx answers
+        with exponential backoff; the last response or error is surfaced
+        """
+        attempt = 0
+        while True:
+            try:
+                if self._executor is not None:
+                    response = self._hedged_request(url, headers)
+                else:
+                    response = self._request(url, headers)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if attempt >= self.retries:
+                    # Out of retries on a 429/5xx: the caller will skip this page
+                    self._count("failures")
+                    return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.retries:
+                    self._count("failures")
+                    raise
+
+            attempt += 1
+            self._count("retries")
+            incr("news_retries_total")
+            time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    def stats(self):
+        with self._lock:
+            return dict(self.metrics)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
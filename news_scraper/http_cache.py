@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class HttpCache:
+    """
+    On-disk response cache keyed by URL.
+
+    Each entry keeps the ETag / Last-Modified validators, the raw body and
+    optionally the items parsed from it, so a 304 Not Modified answer can
+    skip both the download and the parsing. The cache is bounded to
+    max_bytes on disk; least recently used entries are evicted first.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory=".cache/news_scraper", max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        try:
+            with open(index_path, encoding='utf-8') as index_file:
+                self._index = json.load(index_file)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + suffix)
+
+    def conditional_headers(self, url):
+        """
+        Headers that turn a GET for url into a conditional request
+        """
+        entry = self._index.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_body(self, url):
+        if url not in self._index:
+            return None
+        try:
+            with open(self._path(url, ".html"), 'rb') as body_file:
+                body = body_file.read()
+        except OSError:
+            return None
+        with self._lock:
+            if url in self._index:
+                self._index[url]["accessed"] = time.time()
+        return body
+
+    def get_items(self, url):
+        try:
+            with open(self._path(url, ".json"), encoding='utf-8') as items_file:
+                return json.load(items_file)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, headers, body):
+        """
+        Save a 200 response; responses without validators are not cached
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        with open(self._path(url, ".html"), 'wb') as body_file:
+            body_file.write(body)
+        # Items parsed from a previous body are stale now
+        try:
+            os.remove(self._path(url, ".json"))
+        except OSError:
+            pass
+
+        with self._lock:
+            self._index[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "size": len(body),
+                "accessed": time.time()
+            }
+            self._evict()
+
+    def store_items(self, url, items):
+        if url not in self._index:
+            return
+        data = json.dumps(items, ensure_ascii=False)
+        with open(self._path(url, ".json"), 'w', encoding='utf-8') as items_file:
+            items_file.write(data)
+        with self._lock:
+            if url in self._index:
+                self._index[url]["size"] += len(data)
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for url in sorted(self._index, key=lambda u: self._index[u]["accessed"]):
+            entry = self._index.pop(url)
+            total -= entry["size"]
+            for suffix in (".html", ".json"):
+                try:
+                    os.remove(self._path(url, suffix))
+                except OSError:
+                    pass
+            if total <= self.max_bytes:
+                break
+
+    def save(self):
+        """
+        Persist the index; call once at the end of a run
+        """
+        with self._lock:
+            data = json.dumps(self._index)
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as index_file:
+            index_file.write(data)
+        os.replace(tmp_path, index_path)
@@ -0,0 +1,53 @@
+import json
+
+from metrics import timer
+
+
+class JsonLinesWriter:
+    """
+    Incremental JSON Lines writer: one compact record per line, flushed to
+    disk every batch_size records so other processes can tail the file
+    while the crawl is still running
+    """
+
+    def __init__(self, path, batch_size=100, append=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer = []
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, item):
+        self._buffer.append(json.dumps(item, ensure_ascii=False))
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        with timer("news_write_seconds", format="jsonl"):
+            if self._buffer:
+                self._file.write('\n'.join(self._buffer) + '\n')
+                self._buffer.clear()
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_json_lines(path):
+    """
+    Yield the records of a JSON Lines file one at a time
+    """
+    with open(path, encoding='utf-8') as json_file:
+        for line in json_file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
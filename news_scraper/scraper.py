@@ -1,68 +1,417 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import nullcontext
+import argparse
 import json
 import os
+import threading
 
-def scrape_news():
+from metrics import REGISTRY, incr, timer
+from news_scraper.enrich import Enricher
+from news_scraper.fetcher import Fetcher
+from news_scraper.http_cache import HttpCache
+from news_scraper.output import JsonLinesWriter
+from news_scraper.pipeline import ParsePool
+from news_scraper.search_index import SearchIndex, index_path_for
+from news_scraper.seen_index import SeenIndex
+from news_scraper.sites import PARSER_BACKEND, SITES, get_site
+from news_scraper.storage import HeadlineStore
+
+DEFAULT_SITE = "books"
+
+
+def create_session(max_in_flight=8):
+    """
+    Create a requests session whose connection pool can hold
+    max_in_flight keep-alive connections, shared by all crawl workers
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_in_flight, pool_maxsize=max_in_flight)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_page(session, url, cache=None):
+    """
+    Fetch a single page and return (body, not_modified). With a cache the
+    request is conditional and a 304 answer is served from disk.
+    """
+    headers = cache.conditional_headers(url) if cache else {}
+    response = session.get(url, headers=headers)
+
+    if response.status_code == 304:
+        body = cache.get_body(url) if cache else None
+        if body is not None:
+            incr("news_cache_hits_total")
+            return body, True
+        # Cache entry vanished between the lookup and the answer
+        response = session.get(url)
+
+    response.raise_for_status()  # Raise an exception for bad status codes
+    if cache is not None:
+        cache.store(url, response.headers, response.content)
+    return response.content, False
+
+
+def parse_listing(html, page_url, backend=None, restricted=True, site=DEFAULT_SITE):
+    """
+    Parse one listing page into a list of items with title, link and summary
+
+    Only the item blocks are built into a tree unless restricted is False;
+    backend defaults to lxml when installed, else html.parser.
+    """
+    return get_site(site).plan.extract(html, page_url, backend, restricted)
+
+
+def load_listing(session, url, cache=None, plan=None, parser=None, fetch_slots=None):
+    """
+    Fetch and parse one listing page, returning (body, items). Parsing is
+    skipped when the page is unchanged and its items are already cached.
+
+    With a ParsePool the page is parsed in a worker process; fetch_slots
+    (a semaphore) then bounds the requests, as opposed to the pages
+    waiting for a parser.
+    """
+    plan = plan or get_site(DEFAULT_SITE).plan
+    with fetch_slots or nullcontext():
+        body, not_modified = fetch_page(session, url, cache)
+    if not_modified:
+        items = cache.get_items(url)
+        if items is not None:
+            incr("news_parse_skipped_total")
+            return body, items
+
+    if parser is not None:
+        items = parser.parse(plan, body, url)
+    else:
+        with timer("news_parse_seconds"):
+            items = plan.extract(body, url)
+    incr("news_items_total", len(items))
+    if cache is not None:
+        cache.store_items(url, items)
+    return body, items
+
+
+def crawl_pages(session, pages, max_in_flight=8, cache=None, parser=None):
+    """
+    Fetch and parse (url, site) pages concurrently, keeping at most
+    max_in_flight requests outstanding, and yield (url, site, body, items)
+    in page order. A page that still fails after the fetch layer gave up
+    yields None as body and items instead of aborting the crawl.
+    Pending requests are cancelled if the consumer stops iterating early.
+
+    With a ParsePool, parsing runs in its worker processes and up to
+    parser.max_queued fetched pages more may wait for a parser.
+    """
+    pages = iter(pages)
+    pending = deque()
+    window = max_in_flight
+    fetch_slots = None
+    if parser is not None:
+        window += parser.max_queued
+        fetch_slots = threading.BoundedSemaphore(max_in_flight)
+
+    def work(url, site):
+        try:
+            return (url, site) + load_listing(session, url, cache, site.plan, parser, fetch_slots)
+        except requests.exceptions.RequestException as e:
+            print(f"Skipping {url}: {e}")
+            return url, site, None, None
+
+    with ThreadPoolExecutor(max_workers=window) as executor:
+        try:
+            for page in pages:
+                pending.append(executor.submit(work, *page))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                yield pending.popleft().result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(executor.submit(work, *next_page))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_news(crawl=False, max_pages=None, max_in_flight=8, session=None, cache=None,
+              seen=None, base_url=None, sites=(DEFAULT_SITE,), parser=None):
+    """
+    Yield scraped items page by page from one or more registered sites.
+    Only the front pages are fetched unless crawl is True, in which case
+    every listing page of each site (or the first max_pages of them) is
+    fetched concurrently, all sites sharing the same worker pool.
+
+    With a SeenIndex only new or changed items are yielded, and pagination
+    of a site stops at its first page that holds nothing new.
+
+    base_url replaces the start URL when a single site is scraped.
+    parser is an optional ParsePool that parses pages in worker processes.
+    """
+    session = session or create_session(max_in_flight)
+    adapters = [get_site(name) for name in sites]
+    roots = {site.name: base_url if base_url and len(adapters) == 1 else site.start_url
+             for site in adapters}
+    page_counts = {}
+    stopped = set()
+
+    def fresh_items(site, items):
+        if items is None or site.name in stopped:
+            return []
+        if seen is not None:
+            items = seen.filter_new(items)
+            if not items:
+                stopped.add(site.name)  # Reached already known territory
+        return items
+
+    fronts = crawl_pages(session, [(roots[site.name], site) for site in adapters], max_in_flight, cache,
+                         parser)
+    for url, site, body, items in fronts:
+        if body is None:
+            stopped.add(site.name)
+            continue
+        page_counts[site.name] = site.count_pages(body)
+        if max_pages is not None:
+            page_counts[site.name] = min(page_counts[site.name], max_pages)
+        yield from fresh_items(site, items)
+
+    if not page_counts:
+        raise requests.exceptions.RequestException("No listing page could be fetched")
+    if not crawl:
+        return
+
+    def remaining_pages():
+        # Round-robin over the sites so each one gets its share of the workers
+        for n in range(2, max(page_counts.values()) + 1):
+            for site in adapters:
+                if site.name not in stopped and n <= page_counts.get(site.name, 0):
+                    yield site.page_url(n, roots[site.name]), site
+
+    pages = crawl_pages(session, remaining_pages(), max_in_flight, cache, parser)
+    try:
+        for url, site, body, items in pages:
+            yield from fresh_items(site, items)
+    finally:
+        pages.close()
+
+
+def print_sample(sample):
+    print("Sample data:")
+    for i, item in enumerate(sample):  # Print first 3 items as sample
+        print(f"  {i+1}. Title: {item['title']}")
+        print(f"     Link: {item['link']}")
+        print(f"     Summary: {item['summary']}")
+        print()
+
+
+def print_fetch_stats(stats):
+    print(f"Requests: {stats['requests']}, retries: {stats['retries']}, failures: {stats['failures']}, "
+          f"hedges sent: {stats['hedges_sent']}, hedges won: {stats['hedges_won']}")
+
+
+def scrape_news(crawl=False, max_pages=None, max_in_flight=8,
+                output_format="json", output_file=None, batch_size=100,
+                cache_dir=None, seen_db=None, enrich=False, enrich_rate=5.0,
+                per_host=4, base_url=None, session=None, timeout=10.0, retries=3,
+                hedge_after=None, sites=(DEFAULT_SITE,), db_path=None, parse_workers=0,
+                index=None, raise_errors=False):
     """
     Scraper for news from Books to Scrape (as example) or G1
     Extracts title, link, and summary when available
     Saves data to manchetes.json
+
+    sites names the registered site adapters to scrape (see sites.py);
+    several sites are crawled together in a single concurrent run.
+
+    With crawl=True all paginated listing pages are fetched over a shared
+    pooled session, with at most max_in_flight requests at a time.
+
+    With output_format="jsonl" items are streamed to manchetes.jsonl one
+    record per line as they are parsed, flushed every batch_size records,
+    and only the number of items written is returned instead of the list.
+
+    With cache_dir set, responses are kept in an on-disk HTTP cache and
+    re-fetched with conditional requests; unchanged pages are not re-parsed.
+
+    With seen_db set, the run is incremental: only items whose link is new
+    (or whose content changed) since earlier runs are emitted, crawling
+    stops once it reaches known pages, and JSON Lines output is appended.
+
+    With enrich=True each item's detail page is fetched to replace the price
+    summary with the real description, at most enrich_rate requests per
+    second and per_host concurrent requests against the same host.
+
+    Every request has a timeout and is retried up to retries times with
+    exponential backoff; listing pages that still fail are skipped. With
+    hedge_after (seconds, or "auto" for the observed p95 latency) a
+    duplicate request is raced against any request slower than that.
+
+    With db_path set, items are also written to an indexed sqlite database
+    (see HeadlineStore) in batched transactions.
+
+    With parse_workers set, listing pages are parsed in that many worker
+    processes (None for one per core) while the threads keep fetching,
+    instead of in the fetch threads (see ParsePool).
+
+    With index set (a path, or True for one next to the output file), the
+    titles are added to a keyword SearchIndex as items stream through,
+    extending the index saved by earlier runs.
+
+    Errors are printed and an empty list is returned, unless raise_errors
+    is True, in which case they are re-raised after printing so callers
+    can tell a failed run from one that found nothing new.
     """
-    # Using Books to Scrape as example site
-    base_url = "http://books.toscrape.com/"
-    
+    cache = HttpCache(cache_dir) if cache_dir else None
+    seen = SeenIndex(seen_db) if seen_db else None
+    store = HeadlineStore(db_path) if db_path else None
+    fetcher = Fetcher(session or create_session(2 * max_in_flight + (per_host if enrich else 0)),
+                      timeout=timeout, retries=retries, hedge_after=hedge_after,
+                      max_workers=2 * max_in_flight + per_host)
+    parser = ParsePool(parse_workers or None) if parse_workers != 0 else None
+    if index is True:
+        output_file = output_file or ("manchetes.jsonl" if output_format == "jsonl" else "manchetes.json")
+        index = index_path_for(output_file)
+    search_index = SearchIndex(index) if index else None
     try:
-        response = requests.get(base_url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        books = soup.find_all('article', class_='product_pod')
-        
-        news_data = []
-        
-        for book in books:
-            title_element = book.find('h3').find('a')
-            title = title_element['title'] if title_element else "No title"
-            
-            link_element = book.find('h3').find('a')
-            link = base_url + link_element['href'][3:] if link_element else "No link"  # Remove '../' from href
-            
-            price_element = book.find('p', class_='price_color')
-            price = price_element.get_text() if price_element else "No price"
-            
-            # For books, the price can serve as a "summary" since there's no actual summary
-            summary = f"Price: {price}"
-            
-            news_item = {
-                "title": title,
-                "link": link,
-                "summary": summary
-            }
-            
-            news_data.append(news_item)
-        
+        items = iter_news(crawl, max_pages, max_in_flight, session=fetcher, cache=cache, seen=seen,
+                          base_url=base_url, sites=sites, parser=parser)
+        if enrich:
+            enricher = Enricher(lambda url: fetch_page(fetcher, url, cache)[0], rate=enrich_rate,
+                                per_host=per_host, max_workers=max_in_flight, backend=PARSER_BACKEND)
+            items = enricher.enrich_stream(items)
+        if store is not None:
+            items = store.record(items)
+        if search_index is not None:
+            items = search_index.record(items)
+
+        if output_format == "jsonl":
+            output_file = output_file or "manchetes.jsonl"
+            sample = []
+            with JsonLinesWriter(output_file, batch_size, append=seen is not None) as writer:
+                for item in items:
+                    writer.write(item)
+                    if len(sample) < 3:
+                        sample.append(item)
+
+            if seen is not None:
+                seen.commit()
+            if search_index is not None:
+                search_index.save()
+            print(f"Successfully scraped {writer.count} items and saved to {output_file}")
+            print_fetch_stats(fetcher.stats())
+            print_sample(sample)
+            return writer.count
+
+        news_data = list(items)
+
         # Save to JSON file
-        output_file = "manchetes.json"
-        with open(output_file, 'w', encoding='utf-8') as json_file:
+        output_file = output_file or "manchetes.json"
+        with timer("news_write_seconds", format="json"), open(output_file, 'w', encoding='utf-8') as json_file:
             json.dump(news_data, json_file, ensure_ascii=False, indent=4)
-        
+        if seen is not None:
+            seen.commit()
+        if search_index is not None:
+            search_index.save()
+
         print(f"Successfully scraped {len(news_data)} items and saved to {output_file}")
-        print("Sample data:")
-        for i, item in enumerate(news_data[:3]):  # Print first 3 items as sample
-            print(f"  {i+1}. Title: {item['title']}")
-            print(f"     Link: {item['link']}")
-            print(f"     Summary: {item['summary']}")
-            print()
-        
+        print_fetch_stats(fetcher.stats())
+        print_sample(news_data[:3])
+
         return news_data
-        
+
     except requests.exceptions.RequestException as e:
         print(f"Error fetching the webpage: {e}")
+        if raise_errors:
+            raise
         return []
     except Exception as e:
         print(f"An error occurred: {e}")
+        if raise_errors:
+            raise
         return []
+    finally:
+        fetcher.close()
+        if parser is not None:
+            parser.close()
+        if cache is not None:
+            cache.save()
+        if seen is not None:
+            seen.close()
+        if store is not None:
+            store.close()
+
+
+def positive_float(text):
+    value = float(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape headlines into manchetes.json")
+    parser.add_argument("--site", dest="sites", action="append", choices=sorted(SITES),
+                        help="site to scrape, repeat for several (default: books)")
+    parser.add_argument("--crawl", action="store_true", help="walk every paginated listing page")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--cache-dir", default=None, help="enable the on-disk HTTP cache")
+    parser.add_argument("--seen-db", default=None, help="emit only items not seen in earlier runs")
+    parser.add_argument("--db", dest="db_path", default=None, help="also store items in this sqlite database")
+    parser.add_argument("--enrich", action="store_true", help="fetch detail pages for the real description")
+    parser.add_argument("--enrich-rate", type=positive_float, default=5.0, help="detail requests per second")
+    parser.add_argument("--per-host", type=int, default=4, help="concurrent detail requests per host")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--hedge-after", default=None,
+                        help='send a duplicate request after this many seconds, or "auto" for p95')
+    parser.add_argument("--index", nargs="?", const=True, default=None, metavar="PATH",
+                        help="build a keyword search index (default: next to the output file)")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="parse pages in this many processes (-1 for one per core, 0 to parse in threads)")
+    parser.add_argument("--metrics", metavar="PREFIX", default=None,
+                        help="write phase timings to PREFIX.prom and PREFIX.json")
+    return parser
+
+
+def scrape_from_args(args, raise_errors=False):
+    """
+    Run scrape_news with options parsed by build_parser()
+    """
+    hedge_after = args.hedge_after
+    if hedge_after not in (None, "auto"):
+        hedge_after = float(hedge_after)
+
+    return scrape_news(args.crawl, args.max_pages, args.max_in_flight,
+                       output_format=args.format, output_file=args.output,
+                       cache_dir=args.cache_dir, seen_db=args.seen_db, enrich=args.enrich,
+                       enrich_rate=args.enrich_rate, per_host=args.per_host, timeout=args.timeout,
+                       retries=args.retries, hedge_after=hedge_after, sites=args.sites or (DEFAULT_SITE,),
+                       db_path=args.db_path, index=args.index,
+                       parse_workers=None if args.parse_workers < 0 else args.parse_workers,
+                       raise_errors=raise_errors)
+
+
+def main(argv=None):
+    """
+    Command line entry point; returns the exit status, 1 if the run failed
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        scrape_from_args(args, raise_errors=True)
+    except Exception:
+        return 1  # Already reported by scrape_news
+    finally:
+        if args.metrics:
+            REGISTRY.write(args.metrics)
+    return 0
+
 
 if __name__ == "__main__":
-    scrape_news()
\ No newline at end of file
+    raise SystemExit(main())
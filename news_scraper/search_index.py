@@ -0,0 +1,259 @@
+"""
+Inverted index for keyword search over scraped headlines
+
+Maps every title token to the sorted list of ids of the items that
+contain it, so a query only touches the posting lists of its terms
+instead of scanning every title. The index is built as items stream
+through the scraper and saved as JSON next to the output:
+
+    python -m news_scraper.search_index manchetes.index.json "economia brasil*"
+
+Every query term must match (AND). A term ending in '*' matches every
+token with that prefix. Accents and case are ignored.
+"""
+from bisect import bisect_left
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Combining marks left by NFKD normalization, i.e. the accents
+ACCENTS_RE = re.compile(r"[\u0300-\u036f]")
+
+INDEX_VERSION = 1
+
+# Posting entries a prefix term must have per candidate id before the
+# candidates' titles are re-tokenized instead of merging those postings
+PREFIX_FILTER_RATIO = 50
+
+
+def tokenize(text):
+    """
+    Lowercase, accent-free word tokens of text
+    """
+    if not text:
+        return []
+    text = text.lower()
+    if not text.isascii():
+        text = ACCENTS_RE.sub("", unicodedata.normalize("NFKD", text))
+    return TOKEN_RE.findall(text)
+
+
+def intersect(postings):
+    """
+    Ids present in every sorted posting list. Lists are intersected from
+    the shortest up, and each id is looked up with a binary search that
+    resumes where the previous one stopped.
+    """
+    postings = sorted(postings, key=len)
+    if not postings:
+        return []
+    result = postings[0]
+    for other in postings[1:]:
+        matches = []
+        low = 0
+        for doc_id in result:
+            low = bisect_left(other, doc_id, low)
+            if low == len(other):
+                break
+            if other[low] == doc_id:
+                matches.append(doc_id)
+        result = matches
+        if not result:
+            break
+    return result
+
+
+class SearchIndex:
+    """
+    Title index of scraped items, kept in memory and persisted to path.
+
+    Item ids grow with every added item, so appending keeps each posting
+    list sorted. An item whose link was indexed before replaces the old
+    entry when its title changed.
+
+    A missing path starts an empty index, unless create is False, in
+    which case FileNotFoundError is raised.
+    """
+
+    def __init__(self, path=None, create=True):
+        self.path = path
+        self.docs = []
+        self.postings = {}
+        self._ids = None
+        self._vocabulary = None
+        if path and os.path.exists(path):
+            self.load(path)
+        elif path and not create:
+            raise FileNotFoundError(f"Search index not found: {path}")
+
+    def _link_ids(self):
+        # Only needed to add items, so a loaded index builds it on the first add()
+        if self._ids is None:
+            self._ids = {doc[0]: doc_id for doc_id, doc in enumerate(self.docs) if doc is not None and doc[0]}
+        return self._ids
+
+    def add(self, item):
+        link = item.get("link") or ""
+        title = item.get("title") or ""
+        ids = self._link_ids()
+        previous = ids.get(link) if link else None
+        if previous is not None:
+            if self.docs[previous][1] == title:
+                return previous
+            self.docs[previous] = None  # Stale ids are skipped in results
+
+        doc_id = len(self.docs)
+        self.docs.append([link, title])
+        if link:
+            ids[link] = doc_id
+        for token in set(tokenize(title)):
+            posting = self.postings.get(token)
+            if posting is None:
+                self.postings[token] = [doc_id]
+                self._vocabulary = None
+            else:
+                posting.append(doc_id)
+        return doc_id
+
+    def record(self, items):
+        """
+        Index items from an iterable while passing them through unchanged
+        """
+        for item in items:
+            self.add(item)
+            yield item
+
+    def _vocabulary_range(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\uffff", start)
+        return self._vocabulary[start:end]
+
+    def _prefix_postings(self, prefix):
+        return [self.postings[token] for token in self._vocabulary_range(prefix)]
+
+    @staticmethod
+    def _union(postings):
+        if len(postings) <= 1:
+            return postings[0] if postings else []
+        return sorted(set().union(*postings))
+
+    def _filter_prefix(self, ids, prefix):
+        return [doc_id for doc_id in ids
+                if self.docs[doc_id] is not None
+                and any(token.startswith(prefix) for token in tokenize(self.docs[doc_id][1]))]
+
+    def search_ids(self, query):
+        """
+        Ids of the items whose title matches every term of query
+        """
+        exact, prefixes = [], []
+        for raw in query.split():
+            tokens = tokenize(raw)
+            if raw.endswith("*") and tokens:
+                exact.extend(tokens[:-1])
+                prefixes.append(tokens[-1])
+            else:
+                exact.extend(tokens)
+        if not exact and not prefixes:
+            return []
+
+        if exact:
+            ids = intersect([self.postings.get(term, []) for term in exact])
+        else:
+            ids = self._union(self._prefix_postings(prefixes.pop()))
+        for prefix in prefixes:
+            if not ids:
+                break
+            postings = self._prefix_postings(prefix)
+            # Re-checking a few titles beats merging the postings of a common prefix
+            if len(ids) * PREFIX_FILTER_RATIO < sum(map(len, postings)):
+                ids = self._filter_prefix(ids, prefix)
+            else:
+                ids = intersect([ids, self._union(postings)])
+        return [doc_id for doc_id in ids if self.docs[doc_id] is not None]
+
+    def search(self, query, limit=20):
+        """
+        Matching items as dicts with title and link, most recent first
+        """
+        ids = self.search_ids(query)
+        results = []
+        for doc_id in reversed(ids):
+            link, title = self.docs[doc_id]
+            results.append({"title": title, "link": link or None})
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def __len__(self):
+        return sum(1 for doc in self.docs if doc is not None)
+
+    def load(self, path):
+        with open(path, encoding='utf-8') as index_file:
+            data = json.load(index_file)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version in {path}")
+        self.docs = data["docs"]
+        self.postings = data["postings"]
+        self._ids = None
+        self._vocabulary = None
+
+    def save(self, path=None):
+        """
+        Write the index atomically to path, by default the one it was
+        opened with
+        """
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = path + ".tmp"
+        # dumps() runs the C encoder, dump() to a file does not
+        data = json.dumps({"version": INDEX_VERSION, "docs": self.docs, "postings": self.postings},
+                          ensure_ascii=False, separators=(",", ":"))
+        with open(temporary, 'w', encoding='utf-8') as index_file:
+            index_file.write(data)
+        os.replace(temporary, path)
+
+
+def index_path_for(output_file):
+    """
+    Where the index of an output file is kept: manchetes.json -> manchetes.index.json
+    """
+    return os.path.splitext(output_file)[0] + ".index.json"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search scraped headlines by keyword")
+    parser.add_argument("index", help="index file, e.g. manchetes.index.json")
+    parser.add_argument("query", help='terms that must all match; end a term with * for a prefix')
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        index = SearchIndex(args.index, create=False)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 1
+    loaded = time.perf_counter()
+    results = index.search(args.query, args.limit)
+    searched = time.perf_counter()
+
+    for result in results:
+        print(f"{result['title']}\n    {result['link']}")
+    print(f"{len(index.search_ids(args.query))} matches among {len(index)} items "
+          f"(load {(loaded - start) * 1000:.1f} ms, search {(searched - loaded) * 1000:.3f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
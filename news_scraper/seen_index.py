@@ -0,0 +1,69 @@
+import hashlib
+import os
+import sqlite3
+
+
+class SeenIndex:
+    """
+    Persistent index of already-scraped links, stored in sqlite.
+
+    Each link maps to a short digest of the item content, so an item is
+    reported again only if it is new or its title/summary changed.
+    Changes are only made durable by commit(), so a failed run does not
+    mark items that were never written out.
+    """
+
+    def __init__(self, path=".cache/news_scraper/seen.db"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " link TEXT PRIMARY KEY,"
+            " digest BLOB NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+    @staticmethod
+    def digest(item):
+        content = f"{item.get('title')}\x00{item.get('summary')}".encode('utf-8')
+        return hashlib.blake2b(content, digest_size=8).digest()
+
+    def filter_new(self, items):
+        """
+        Return the items that are new or changed and record them as seen.
+        Items without a link cannot be tracked and are always returned.
+        """
+        untracked = [item for item in items if not item.get("link")]
+        items = [item for item in items if item.get("link")]
+        if not items:
+            return untracked
+
+        links = [item["link"] for item in items]
+        placeholders = ",".join("?" * len(links))
+        known = dict(self.conn.execute(
+            f"SELECT link, digest FROM seen WHERE link IN ({placeholders})", links
+        ))
+
+        fresh = []
+        for item in items:
+            digest = self.digest(item)
+            if known.get(item["link"]) != digest:
+                fresh.append((item, digest))
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO seen (link, digest) VALUES (?, ?)",
+            [(item["link"], digest) for item, digest in fresh]
+        )
+        return [item for item, _ in fresh] + untracked
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        # Anything not committed is discarded
+        self.conn.close()
@@ -0,0 +1,155 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urljoin
+import re
+
+try:
+    import lxml  # noqa: F401
+    PARSER_BACKEND = 'lxml'
+except ImportError:
+    PARSER_BACKEND = 'html.parser'
+
+
+def _compile_selector(selector):
+    """
+    Turn a simple descendant selector like "h3 a" or "div.feed-post" into
+    a chain of (tag, class) lookups for Tag.find
+    """
+    chain = []
+    for part in selector.split():
+        tag, _, css_class = part.partition('.')
+        chain.append((tag or True, css_class or None))
+    return chain
+
+
+def _find(element, chain):
+    for tag, css_class in chain:
+        if css_class:
+            element = element.find(tag, class_=css_class)
+        else:
+            element = element.find(tag)
+        if element is None:
+            return None
+    return element
+
+
+class ExtractionPlan:
+    """
+    Reusable extraction plan compiled from a site's selectors: a strainer
+    that limits the tree to the item blocks, and per-item lookup chains.
+    Fields sharing a selector are resolved with a single lookup.
+    """
+
+    def __init__(self, item_selector, fields):
+        (item_tag, item_class), = _compile_selector(item_selector)
+        self.item_tag = item_tag
+        self.item_class = item_class
+        self.strainer = SoupStrainer(item_tag, class_=item_class)
+
+        groups = {}
+        for name, spec in fields.items():
+            selector, attribute = spec[0], spec[1]
+            template = spec[2] if len(spec) > 2 else None
+            groups.setdefault(selector, []).append((name, attribute, template))
+        self.lookups = [(_compile_selector(selector), specs) for selector, specs in groups.items()]
+        self.field_names = list(fields)
+
+    def extract(self, html, page_url, backend=None, restricted=True):
+        soup = BeautifulSoup(html, backend or PARSER_BACKEND,
+                             parse_only=self.strainer if restricted else None)
+
+        items = []
+        for block in soup.find_all(self.item_tag, class_=self.item_class):
+            item = dict.fromkeys(self.field_names)
+            for chain, specs in self.lookups:
+                element = _find(block, chain)
+                if element is None:
+                    continue
+                for name, attribute, template in specs:
+                    if attribute is None:
+                        value = element.get_text(strip=True)
+                    elif attribute == 'href':
+                        value = urljoin(page_url, element.get('href', ''))
+                    else:
+                        value = element.get(attribute)
+                    if value is not None and template:
+                        value = template.format(value)
+                    item[name] = value
+            items.append(item)
+        return items
+
+
+class SiteAdapter:
+    """
+    Declares how one source is scraped: where its listing starts, how
+    listing pages are numbered and counted, and the field selectors.
+
+    fields maps an item field to (selector, attribute[, template]), where
+    attribute None means the element text and 'href' is resolved against
+    the page URL. Page n > 1 lives at urljoin(start_url, page_path.format(n));
+    the page count is read with total_pages_re, or fixed at max_pages.
+    """
+
+    def __init__(self, name, start_url, page_path, item_selector, fields,
+                 total_pages_re=None, max_pages=1):
+        self.name = name
+        self.start_url = start_url
+        self.page_path = page_path
+        self.total_pages_re = re.compile(total_pages_re) if total_pages_re else None
+        self.max_pages = max_pages
+        self.plan = ExtractionPlan(item_selector, fields)
+
+    def page_url(self, n, base_url=None):
+        return urljoin(base_url or self.start_url, self.page_path.format(n))
+
+    def count_pages(self, html):
+        """
+        Total number of listing pages, read from the first page if possible
+        """
+        if self.total_pages_re is None:
+            return self.max_pages
+        match = self.total_pages_re.search(html)
+        return int(match.group(1)) if match else 1
+
+
+SITES = {}
+
+
+def register_site(adapter):
+    SITES[adapter.name] = adapter
+    return adapter
+
+
+def get_site(name):
+    try:
+        return SITES[name]
+    except KeyError:
+        raise ValueError(f"Unknown site '{name}', available: {', '.join(SITES)}") from None
+
+
+register_site(SiteAdapter(
+    name="books",
+    start_url="http://books.toscrape.com/",
+    page_path="catalogue/page-{}.html",
+    item_selector="article.product_pod",
+    fields={
+        "title": ("h3 a", "title"),
+        "link": ("h3 a", "href"),
+        # For books, the price can serve as a "summary" since there's no actual summary
+        "summary": ("p.price_color", None, "Price: {}")
+    },
+    # "Page 1 of 50" in the pager at the bottom of every listing page
+    total_pages_re=rb"Page\s+\d+\s+of\s+(\d+)"
+))
+
+register_site(SiteAdapter(
+    name="g1",
+    start_url="https://g1.globo.com/",
+    page_path="index/feed/pagina-{}.ghtml",
+    item_selector="div.feed-post",
+    fields={
+        "title": ("a.feed-post-link", None),
+        "link": ("a.feed-post-link", "href"),
+        "summary": ("div.feed-post-body-resumo", None)
+    },
+    max_pages=5
+))
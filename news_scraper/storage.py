@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import time
+
+from metrics import timer
+
+
+class HeadlineStore:
+    """
+    Indexed sqlite storage for scraped headlines.
+
+    Items are unique on link (a re-scraped link updates its row) and
+    indexed on title and scrape time. Writes are buffered and applied in
+    batched transactions of batch_size rows.
+    """
+
+    def __init__(self, path="manchetes.db", batch_size=500):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.batch_size = batch_size
+        self._buffer = []
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS headlines ("
+                " id INTEGER PRIMARY KEY,"
+                " link TEXT NOT NULL UNIQUE,"
+                " title TEXT,"
+                " summary TEXT,"
+                " scraped_at REAL NOT NULL"
+                ")"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_headlines_title ON headlines (title)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_headlines_scraped_at ON headlines (scraped_at)")
+
+    def add(self, item, scraped_at=None):
+        if not item.get("link"):
+            return
+        self._buffer.append((item["link"], item.get("title"), item.get("summary"),
+                             scraped_at or time.time()))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, items):
+        for item in items:
+            self.add(item)
+        self.flush()
+
+    def record(self, items):
+        """
+        Store items from an iterable while passing them through unchanged
+        """
+        for item in items:
+            self.add(item)
+            yield item
+
+    def flush(self):
+        if not self._buffer:
+            return
+        with timer("news_db_write_seconds"), self.conn:
+            self.conn.executemany(
+                "INSERT INTO headlines (link, title, summary, scraped_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(link) DO UPDATE SET"
+                " title = excluded.title, summary = excluded.summary, scraped_at = excluded.scraped_at",
+                self._buffer
+            )
+        self._buffer.clear()
+
+    # Queries
+
+    def get(self, link):
+        row = self.conn.execute(
+            "SELECT link, title, summary, scraped_at FROM headlines WHERE link = ?", (link,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def __contains__(self, link):
+        return self.conn.execute(
+            "SELECT 1 FROM headlines WHERE link = ?", (link,)
+        ).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM headlines").fetchone()[0]
+
+    def search_title(self, prefix, limit=50):
+        """
+        Headlines whose title starts with prefix (case sensitive), using
+        the title index as a range scan
+        """
+        rows = self.conn.execute(
+            "SELECT link, title, summary, scraped_at FROM headlines"
+            " WHERE title >= ? AND title < ? ORDER BY title LIMIT ?",
+            (prefix, prefix + "\U0010ffff", limit)
+        )
+        return [dict(row) for row in rows]
+
+    def latest(self, limit=20):
+        rows = self.conn.execute(
+            "SELECT link, title, summary, scraped_at FROM headlines"
+            " ORDER BY scraped_at DESC LIMIT ?", (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def scraped_between(self, start, end, limit=1000):
+        """
+        Headlines scraped between the start and end unix timestamps
+        """
+        rows = self.conn.execute(
+            "SELECT link, title, summary, scraped_at FROM headlines"
+            " WHERE scraped_at BETWEEN ? AND ? ORDER BY scraped_at LIMIT ?",
+            (start, end, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.flush()
+        self.conn.close()